@@ -0,0 +1,57 @@
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accepts_brotli = re.compile(r"\bbr\b")
+
+BROTLI_PATH_PREFIX = "/api/"
+BROTLI_CONTENT_TYPE = "application/json"
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Сжимает JSON ответы API brotli, если клиент его принимает и
+    установлен модуль brotli. Остальные ответы, в том числе HTML
+    админки и browsable API с CSRF токенами, сжимает родительский
+    GZipMiddleware: он добавляет случайные байты против BREACH.
+
+    Уровень brotli задаёт API_BROTLI_QUALITY: максимальный 11 слишком
+    медленный для ответов, которые собираются на каждый запрос.
+    """
+
+    def process_response(self, request, response):
+        if (
+            brotli is None
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or not request.path.startswith(BROTLI_PATH_PREFIX)
+            or not response.get("Content-Type", "").startswith(
+                BROTLI_CONTENT_TYPE
+            )
+            or len(response.content) < 200
+            or not re_accepts_brotli.search(
+                request.META.get("HTTP_ACCEPT_ENCODING", "")
+            )
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed = brotli.compress(
+            response.content, quality=settings.API_BROTLI_QUALITY
+        )
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация списка задач.
+
+    Страница выбирается по позиции в индексе (user, -created_at, id),
+    поэтому её стоимость не зависит от того, насколько далеко пролистан
+    список.
+    """
+
+    ordering = ("-created_at", "id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
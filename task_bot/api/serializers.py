@@ -1,19 +1,70 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from bot.models import Category, Task, User
 
+BULK_MAX_SIZE = 500
 
-class CategorySerializer(serializers.ModelSerializer):
+
+class PrimaryKeyListField(serializers.ManyRelatedField):
+    """
+    Список первичных ключей, который проверяется одним запросом,
+    а не отдельным запросом на каждый ключ.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        pks = []
+        for pk in data:
+            if isinstance(pk, bool):
+                self.child_relation.fail(
+                    'incorrect_type', data_type=type(pk).__name__
+                )
+            try:
+                pk = int(pk)
+            except (TypeError, ValueError):
+                self.child_relation.fail(
+                    'incorrect_type', data_type=type(pk).__name__
+                )
+            if pk not in pks:
+                pks.append(pk)
+        objects = self.child_relation.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                self.child_relation.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class SparseFieldsMixin:
+    """
+    Оставляет в сериализаторе только поля из context["fields"],
+    если представление их передало (параметр fields=).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Category
         fields = "__all__"
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     owner_tg_id = serializers.IntegerField(write_only=True)
-    category = serializers.PrimaryKeyRelatedField(
-        queryset=Category.objects.all(), many=True
+    category = PrimaryKeyListField(
+        child_relation=serializers.PrimaryKeyRelatedField(
+            queryset=Category.objects.all()
+        )
     )
 
     user = serializers.StringRelatedField(read_only=True)
@@ -41,9 +92,260 @@ class TaskSerializer(serializers.ModelSerializer):
             defaults={'username': str(tg_id)}
         )
         task = Task.objects.create(user=user, **validated_data)
-        task.category.set(categories)
+        task.category.add(*categories)
         return task
 
+    def update(self, instance, validated_data):
+        # Перенесённой задаче напоминание нужно заново: сброс отметки
+        # возвращает её в выборку dispatch_due_reminders, а уже
+        # поставленное в очередь напоминание будет отброшено.
+        due_date = validated_data.get("due_date", instance.due_date)
+        if due_date != instance.due_date:
+            instance.reminder_sent_at = None
+        return super().update(instance, validated_data)
+
+
+class TaskIdsSerializer(serializers.Serializer):
+    """Список ID задач для массовых операций."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=BULK_MAX_SIZE,
+    )
+
+
+class TaskBulkCategorySerializer(TaskIdsSerializer):
+    """Массовое назначение категорий задачам."""
+
+    category = PrimaryKeyListField(
+        child_relation=serializers.PrimaryKeyRelatedField(
+            queryset=Category.objects.all()
+        )
+    )
+    replace = serializers.BooleanField(default=False)
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    category = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False
+    )
+
+    class Meta:
+        model = Task
+        fields = ["title", "description", "due_date", "category"]
+
+
+class TaskBulkCreateSerializer(serializers.Serializer):
+    """
+    Массовое создание задач одного пользователя.
+
+    Категории всех задач проверяются одним запросом, задачи и их связи
+    с категориями вставляются двумя bulk_create в одной транзакции.
+    """
+
+    owner_tg_id = serializers.IntegerField()
+    tasks = TaskBulkItemSerializer(
+        many=True, allow_empty=False, max_length=BULK_MAX_SIZE
+    )
+
+    def validate(self, attrs):
+        category_ids = {
+            pk for item in attrs["tasks"] for pk in item["category"]
+        }
+        existing = set(
+            Category.objects.filter(
+                id__in=category_ids
+            ).values_list("id", flat=True)
+        )
+        missing = sorted(category_ids - existing)
+        if missing:
+            raise serializers.ValidationError(
+                {"tasks": f"Категории не найдены: {missing}."}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        tg_id = validated_data["owner_tg_id"]
+        with transaction.atomic():
+            user, created = User.objects.get_or_create(
+                telegram_id=tg_id,
+                defaults={'username': str(tg_id)}
+            )
+            items = validated_data["tasks"]
+            tasks = Task.objects.bulk_create(
+                Task(
+                    user=user,
+                    **{
+                        name: value for name, value in item.items()
+                        if name != "category"
+                    },
+                )
+                for item in items
+            )
+            through = Task.category.through
+            through.objects.bulk_create(
+                through(task_id=task.id, category_id=category_id)
+                for task, item in zip(tasks, items)
+                for category_id in dict.fromkeys(item["category"])
+            )
+        return tasks
+
+
+TASK_LIST_VALUES = (
+    "id",
+    "title",
+    "description",
+    "created_at",
+    "due_date",
+    "completed",
+    "user__telegram_id",
+)
+
+# Поля списка задач в порядке TaskSerializer и столбцы, которые
+# нужно выбрать для каждого из них.
+TASK_LIST_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "created_at": "created_at",
+    "due_date": "due_date",
+    "completed": "completed",
+    "category": None,
+    "user": "user__telegram_id",
+}
+
+
+def task_list_values(fields=None):
+    """
+    Столбцы для .values() под набор полей fields. id и created_at
+    выбираются всегда: по ним строится курсор пагинации.
+    """
+    if not fields:
+        return TASK_LIST_VALUES
+    columns = ["id", "created_at"]
+    for name in fields:
+        column = TASK_LIST_FIELDS[name]
+        if column is not None and column not in columns:
+            columns.append(column)
+    return tuple(columns)
+
+
+def serialize_task_rows(rows, fields=None):
+    """
+    Быстрое представление списка задач из строк .values(TASK_LIST_VALUES).
+
+    Формирует тот же JSON, что и TaskSerializer, но без создания моделей
+    и дерева полей на каждую строку. ID категорий загружаются одним
+    запросом к промежуточной таблице на всю страницу. При заданном
+    fields строки выбираются через task_list_values(fields), а в JSON
+    попадают только эти поля.
+    """
+    rows = list(rows)
+    task_ids = [row["id"] for row in rows]
+    links = []
+    if task_ids and (not fields or "category" in fields):
+        links = Task.category.through.objects.filter(
+            task_id__in=task_ids
+        ).order_by("id").values_list("task_id", "category_id")
+    return build_task_rows(rows, links, fields)
+
+
+async def aserialize_task_rows(rows, fields=None):
+    """
+    serialize_task_rows для асинхронного кода: строки уже загружены,
+    ID категорий выбираются через асинхронный ORM.
+    """
+    links = []
+    if rows and (not fields or "category" in fields):
+        links = [
+            link async for link in Task.category.through.objects.filter(
+                task_id__in=[row["id"] for row in rows]
+            ).order_by("id").values_list("task_id", "category_id")
+        ]
+    return build_task_rows(rows, links, fields)
+
+
+def build_task_rows(rows, links, fields=None):
+    """
+    Собирает JSON задач из строк .values(TASK_LIST_VALUES) и пар
+    (task_id, category_id) промежуточной таблицы. Не обращается к базе,
+    поэтому подходит и для асинхронного кода.
+    """
+    if fields:
+        return _build_sparse_task_rows(rows, links, fields)
+    categories = {row["id"]: [] for row in rows}
+    for task_id, category_id in links:
+        categories[task_id].append(category_id)
+
+    datetime_field = serializers.DateTimeField()
+    user_names = {}
+    data = []
+    for row in rows:
+        telegram_id = row["user__telegram_id"]
+        if telegram_id not in user_names:
+            user_names[telegram_id] = str(User(telegram_id=telegram_id))
+        due_date = row["due_date"]
+        data.append({
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "created_at": datetime_field.to_representation(
+                row["created_at"]
+            ),
+            "due_date": (
+                datetime_field.to_representation(due_date)
+                if due_date is not None else None
+            ),
+            "completed": row["completed"],
+            "category": categories[row["id"]],
+            "user": user_names[telegram_id],
+        })
+    return data
+
+
+def _build_sparse_task_rows(rows, links, fields):
+    """build_task_rows, который собирает только поля из fields."""
+    fields = [name for name in TASK_LIST_FIELDS if name in fields]
+    categories = {}
+    if "category" in fields:
+        categories = {row["id"]: [] for row in rows}
+        for task_id, category_id in links:
+            categories[task_id].append(category_id)
+    datetime_field = serializers.DateTimeField()
+    data = []
+    for row in rows:
+        task = {}
+        for name in fields:
+            if name == "category":
+                task[name] = categories[row["id"]]
+            elif name == "user":
+                task[name] = str(User(telegram_id=row["user__telegram_id"]))
+            elif name in ("created_at", "due_date"):
+                value = row[name]
+                task[name] = (
+                    datetime_field.to_representation(value)
+                    if value is not None else None
+                )
+            else:
+                task[name] = row[name]
+        data.append(task)
+    return data
+
+
+def add_category_names(tasks, categories):
+    """
+    Добавляет к задачам списка поле category_names с названиями
+    категорий из списка categories, без запросов к базе.
+    """
+    names = {category["id"]: category["name"] for category in categories}
+    for task in tasks:
+        task["category_names"] = [
+            names[category_id] for category_id in task["category"]
+            if category_id in names
+        ]
+    return tasks
+
 
 class UserSerializer(serializers.ModelSerializer):
 
@@ -0,0 +1,651 @@
+import io
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from api.renderers import FastJSONParser, FastJSONRenderer
+from api.views import TaskViewSet
+from bot.models import Category, Task, User
+from bot.orm_client import OrmClient
+
+
+class TaskQueryCountTests(APITestCase):
+    """
+    Проверяет, что число SQL-запросов эндпоинтов задач
+    не зависит от количества задач и категорий.
+    """
+
+    TELEGRAM_ID = 1001
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+        cls.categories = [
+            Category.objects.create(name=f"Категория {i}", slug=f"cat-{i}")
+            for i in range(3)
+        ]
+
+    def create_tasks(self, count):
+        tasks = []
+        for i in range(count):
+            task = Task.objects.create(title=f"Задача {i}", user=self.user)
+            task.category.set(self.categories)
+            tasks.append(task)
+        return tasks
+
+    def list_url(self, **params):
+        query = urlencode({"owner_tg_id": self.TELEGRAM_ID, **params})
+        return f"/api/tasks/?{query}"
+
+    def detail_url(self, task):
+        return f"/api/tasks/{task.id}/?owner_tg_id={self.TELEGRAM_ID}"
+
+    def test_list_query_count_does_not_grow_with_tasks(self):
+        self.create_tasks(2)
+        with self.assertNumQueries(2):
+            small = self.client.get(self.list_url())
+        self.create_tasks(18)
+        with self.assertNumQueries(2):
+            large = self.client.get(self.list_url())
+        self.assertEqual(small.status_code, status.HTTP_200_OK)
+        self.assertEqual(large.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(large.data["results"]), 20)
+        self.assertEqual(
+            len(large.data["results"][0]["category"]), len(self.categories)
+        )
+
+    def test_filtered_list_query_count(self):
+        self.create_tasks(5)
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.list_url(
+                    completed="false", category=self.categories[0].id
+                )
+            )
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_retrieve_query_count(self):
+        task = self.create_tasks(1)[0]
+        with self.assertNumQueries(2):
+            response = self.client.get(self.detail_url(task))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"], str(self.user))
+
+    def test_create_query_count_does_not_grow_with_categories(self):
+        payload = {
+            "title": "Новая задача",
+            "owner_tg_id": self.TELEGRAM_ID,
+        }
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                "/api/tasks/",
+                {**payload, "category": [self.categories[0].id]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                "/api/tasks/",
+                {**payload, "category": [cat.id for cat in self.categories]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["category"]), len(self.categories))
+
+    def test_create_rejects_unknown_category(self):
+        response = self.client.post(
+            "/api/tasks/",
+            {
+                "title": "Новая задача",
+                "owner_tg_id": self.TELEGRAM_ID,
+                "category": [self.categories[0].id, 999],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("category", response.data)
+
+    def test_partial_update_query_count(self):
+        task = self.create_tasks(1)[0]
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                self.detail_url(task), {"completed": True}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["completed"])
+
+    def test_due_date_change_resets_reminder(self):
+        task = self.create_tasks(1)[0]
+        Task.objects.filter(id=task.id).update(
+            due_date=timezone.now(), reminder_sent_at=timezone.now()
+        )
+        self.client.patch(
+            self.detail_url(task), {"title": "Другая"}, format="json"
+        )
+        task.refresh_from_db()
+        self.assertIsNotNone(task.reminder_sent_at)
+        self.client.patch(
+            self.detail_url(task),
+            {"due_date": (timezone.now() + timedelta(days=1)).isoformat()},
+            format="json",
+        )
+        task.refresh_from_db()
+        self.assertIsNone(task.reminder_sent_at)
+
+    def test_main_menu_query_count(self):
+        self.create_tasks(3)
+        Task.objects.create(title="Готово", completed=True, user=self.user)
+        url = f"/api/tasks/main_menu/?owner_tg_id={self.TELEGRAM_ID}"
+        with self.assertNumQueries(4):
+            small = self.client.get(url)
+        self.create_tasks(20)
+        with self.assertNumQueries(4):
+            large = self.client.get(url)
+        self.assertEqual(small.status_code, status.HTTP_200_OK)
+        self.assertEqual(large.data["counts"], {"active": 23, "completed": 1})
+        self.assertEqual(len(large.data["tasks"]["results"]), 20)
+        self.assertIsNotNone(large.data["tasks"]["next"])
+        self.assertEqual(
+            large.data["tasks"]["results"][0]["category_names"],
+            [category.name for category in self.categories],
+        )
+        self.assertEqual(len(large.data["categories"]), len(self.categories))
+
+    def test_delete_query_count(self):
+        task = self.create_tasks(1)[0]
+        with self.assertNumQueries(3):
+            response = self.client.delete(self.detail_url(task))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Task.objects.filter(id=task.id).exists())
+
+
+class TaskListFilterTests(APITestCase):
+    """Проверяет, какие задачи оставляют фильтры списка."""
+
+    TELEGRAM_ID = 1101
+    DAY = date(2026, 3, 10)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+        other = User.objects.create(username="1102", telegram_id=1102)
+        cls.work, cls.home = [
+            Category.objects.create(name=name, slug=f"filter-{name}")
+            for name in ("work", "home")
+        ]
+
+        def create(title, due, completed=False, categories=(), user=None):
+            task = Task.objects.create(
+                title=title,
+                due_date=due and timezone.make_aware(due),
+                completed=completed,
+                user=user or cls.user,
+            )
+            task.category.set(categories)
+            return task.id
+
+        day = cls.DAY
+        cls.before = create(
+            "Накануне", datetime.combine(day - timedelta(days=1), time(12)),
+            categories=[cls.work],
+        )
+        cls.on_day = create(
+            "В день", datetime.combine(day, time(10)), categories=[cls.work]
+        )
+        # Поздно вечером в последний день диапазона.
+        cls.late = create(
+            "Поздно", datetime.combine(day + timedelta(days=1), time(23, 30)),
+            completed=True, categories=[cls.home],
+        )
+        cls.no_due = create("Без срока", None)
+        create(
+            "Чужая", datetime.combine(day, time(10)), categories=[cls.work],
+            user=other,
+        )
+
+    def ids(self, **params):
+        query = urlencode({"owner_tg_id": self.TELEGRAM_ID, **params})
+        response = self.client.get(f"/api/tasks/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {task["id"] for task in response.json()["results"]}
+
+    def test_completed(self):
+        self.assertEqual(self.ids(completed="true"), {self.late})
+        self.assertEqual(
+            self.ids(completed="false"),
+            {self.before, self.on_day, self.no_due},
+        )
+
+    def test_category(self):
+        self.assertEqual(
+            self.ids(category=self.work.id), {self.before, self.on_day}
+        )
+        self.assertEqual(
+            self.ids(category=f"{self.work.id},{self.home.id}"),
+            {self.before, self.on_day, self.late},
+        )
+
+    def test_due_date_range(self):
+        day = self.DAY.isoformat()
+        next_day = (self.DAY + timedelta(days=1)).isoformat()
+        # Обе границы включают весь день.
+        self.assertEqual(
+            self.ids(due_date_after=day), {self.on_day, self.late}
+        )
+        self.assertEqual(
+            self.ids(due_date_before=next_day),
+            {self.before, self.on_day, self.late},
+        )
+        self.assertEqual(
+            self.ids(due_date_after=next_day, due_date_before=next_day),
+            {self.late},
+        )
+        self.assertEqual(
+            self.ids(due_date_before=day), {self.before, self.on_day}
+        )
+
+    def test_invalid_values_rejected(self):
+        for params in (
+            {"completed": "maybe"},
+            {"due_date_after": "2026-13-40"},
+            {"due_date_before": "вчера"},
+            {"category": "work"},
+        ):
+            with self.subTest(**params):
+                query = urlencode({"owner_tg_id": self.TELEGRAM_ID, **params})
+                response = self.client.get(f"/api/tasks/?{query}")
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
+                self.assertIn(next(iter(params)), response.json())
+
+
+class TaskListFastPathTests(APITestCase):
+    """Проверяет, что быстрый список задач совпадает с TaskSerializer."""
+
+    TELEGRAM_ID = 2002
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+        categories = [
+            Category.objects.create(name=f"Категория {i}", slug=f"fast-{i}")
+            for i in range(2)
+        ]
+        for i in range(5):
+            task = Task.objects.create(
+                title=f"Задача {i}",
+                description="Описание" if i % 2 else "",
+                due_date=timezone.now() + timedelta(days=i) if i else None,
+                completed=i == 3,
+                user=user,
+            )
+            task.category.set(categories[:i % 3])
+
+    def get_list(self, fast):
+        url = f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}&page_size=3"
+        with patch.object(TaskViewSet, "fast_list", fast):
+            first = self.client.get(url).json()
+            second = self.client.get(first["next"]).json()
+        for page in (first, second):
+            for task in page["results"]:
+                task["category"].sort()
+        return first["results"] + second["results"]
+
+    def test_fast_list_matches_serializer(self):
+        fast = self.get_list(fast=True)
+        self.assertEqual(len(fast), 5)
+        self.assertEqual(fast, self.get_list(fast=False))
+
+    def test_sparse_fields(self):
+        url = (
+            f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}"
+            "&fields=id,title,due_date"
+        )
+        for fast in (True, False):
+            with patch.object(TaskViewSet, "fast_list", fast):
+                with self.assertNumQueries(1):
+                    response = self.client.get(url)
+            tasks = response.json()["results"]
+            self.assertEqual(len(tasks), 5)
+            self.assertEqual(list(tasks[0]), ["id", "title", "due_date"])
+        full = self.client.get(
+            f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}"
+        ).json()["results"]
+        self.assertEqual(
+            tasks,
+            [
+                {name: task[name] for name in ("id", "title", "due_date")}
+                for task in full
+            ],
+        )
+
+    def test_sparse_fields_categories(self):
+        response = self.client.get("/api/categories/?fields=name")
+        self.assertEqual(
+            response.json(), [{"name": "Категория 0"}, {"name": "Категория 1"}]
+        )
+
+    def test_unknown_field_rejected(self):
+        response = self.client.get(
+            f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}&fields=id,secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_compression_negotiation(self):
+        url = f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}"
+        plain = self.client.get(url)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        for accept, encoding in (("gzip", "gzip"), ("gzip, br", "br")):
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING=accept)
+            self.assertEqual(response["Content-Encoding"], encoding)
+            self.assertIn("Accept-Encoding", response["Vary"])
+            self.assertLess(len(response.content), len(plain.content))
+
+    def test_brotli_only_for_api_json(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", password="password")
+        )
+        api = self.client.get(
+            f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}&format=api",
+            HTTP_ACCEPT_ENCODING="gzip, br",
+        )
+        admin = self.client.get(
+            "/admin/bot/task/", HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        for response in (api, admin):
+            self.assertTrue(response["Content-Type"].startswith("text/html"))
+            self.assertEqual(response["Content-Encoding"], "gzip")
+
+
+class MemoryVersions:
+    """SharedVersions в памяти: общий счётчик для нескольких клиентов."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, user_id):
+        return self.values.get(user_id, 0)
+
+    async def bump(self, user_id):
+        self.values[user_id] = self.values.get(user_id, 0) + 1
+        return self.values[user_id]
+
+    async def close(self):
+        pass
+
+
+class OrmClientTests(APITestCase):
+    """Проверяет, что OrmClient отдаёт те же задачи, что и API."""
+
+    TELEGRAM_ID = 4004
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+        cls.category = Category.objects.create(name="Работа", slug="orm")
+        for i in range(5):
+            task = Task.objects.create(
+                title=f"Задача {i}",
+                due_date=timezone.now() + timedelta(days=i) if i else None,
+                completed=i == 3,
+                user=cls.user,
+            )
+            task.category.set([cls.category] if i % 2 else [])
+
+    async def test_pages_match_api(self):
+        client = OrmClient(page_size=2)
+        first = await client.get_tasks_page(self.TELEGRAM_ID, False)
+        second = await client.get_tasks_page(
+            self.TELEGRAM_ID, False, first.next_cursor
+        )
+        previous = await client.get_tasks_page(
+            self.TELEGRAM_ID, False, second.previous_cursor
+        )
+        self.assertIsNone(first.previous_cursor)
+        self.assertIsNone(second.next_cursor)
+        self.assertEqual(previous.tasks, first.tasks)
+        response = await self.async_client.get(
+            f"/api/tasks/?owner_tg_id={self.TELEGRAM_ID}&completed=false"
+        )
+        self.assertEqual(
+            first.tasks + second.tasks, response.json()["results"]
+        )
+
+    async def test_main_menu_matches_api(self):
+        client = OrmClient(page_size=20)
+        page = await client.get_main_menu(self.TELEGRAM_ID)
+        response = await self.async_client.get(
+            f"/api/tasks/main_menu/?owner_tg_id={self.TELEGRAM_ID}"
+        )
+        data = response.json()
+        self.assertEqual(page.tasks, data["tasks"]["results"])
+        self.assertEqual(page.counts, {"active": 4, "completed": 1})
+        self.assertEqual(page.counts, data["counts"])
+        self.assertEqual(page.category_names, {self.category.id: "Работа"})
+        self.assertIs(
+            (await client.get_main_menu(self.TELEGRAM_ID)).tasks, page.tasks
+        )
+
+    async def test_write_operations(self):
+        client = OrmClient()
+        self.assertTrue(
+            await client.add_task(
+                self.TELEGRAM_ID, "Новая", self.category.id,
+                due_date=timezone.localdate(),
+            )
+        )
+        self.assertFalse(
+            await client.add_task(self.TELEGRAM_ID, "Без категории", 0)
+        )
+        task = await Task.objects.aget(title="Новая")
+        self.assertTrue(await client.complete_task(self.TELEGRAM_ID, task.id))
+        self.assertFalse(await client.complete_task(1, task.id))
+        completed = await client.get_tasks(self.TELEGRAM_ID, completed=True)
+        self.assertIn(task.id, [item["id"] for item in completed])
+        self.assertTrue(await client.delete_task(task.id, self.TELEGRAM_ID))
+        self.assertFalse(await Task.objects.filter(id=task.id).aexists())
+
+    async def test_operations_close_old_connections(self):
+        client = OrmClient(page_size=20)
+        with patch("bot.orm_client.close_old_connections") as close:
+            await client.get_main_menu(self.TELEGRAM_ID)
+        # До и после операции, вложенные загрузки соединение не трогают.
+        self.assertEqual(close.call_count, 2)
+
+    async def test_replicas_share_versions(self):
+        versions = MemoryVersions()
+        first = OrmClient(page_size=20, versions=versions)
+        second = OrmClient(page_size=20, versions=versions)
+        menu = await second.get_main_menu(self.TELEGRAM_ID)
+        task_id = menu.tasks[0]["id"]
+        self.assertTrue(await first.complete_task(self.TELEGRAM_ID, task_id))
+        menu = await second.get_main_menu(self.TELEGRAM_ID)
+        self.assertNotIn(task_id, [task["id"] for task in menu.tasks])
+        self.assertEqual(menu.counts, {"active": 3, "completed": 2})
+        task = await second.get_task_by_id(task_id, self.TELEGRAM_ID)
+        self.assertTrue(task["completed"])
+        self.assertTrue(await first.delete_task(task_id, self.TELEGRAM_ID))
+        self.assertIsNone(
+            await second.get_task_by_id(task_id, self.TELEGRAM_ID)
+        )
+        # Своя запись обновляет снимок на месте, без похода в базу.
+        menu = await second.get_main_menu(self.TELEGRAM_ID)
+        self.assertTrue(
+            await second.complete_task(self.TELEGRAM_ID, menu.tasks[0]["id"])
+        )
+        self.assertIsNotNone(
+            second.task_snapshots.peek((self.TELEGRAM_ID, False))
+        )
+
+
+class TaskBulkOperationsTests(APITestCase):
+    """Проверяет массовые операции и то, что они не зависят от объёма."""
+
+    TELEGRAM_ID = 3003
+    OTHER_TELEGRAM_ID = 3004
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+        cls.other = User.objects.create(
+            username=str(cls.OTHER_TELEGRAM_ID),
+            telegram_id=cls.OTHER_TELEGRAM_ID,
+        )
+        cls.categories = [
+            Category.objects.create(name=f"Категория {i}", slug=f"bulk-{i}")
+            for i in range(2)
+        ]
+
+    def create_tasks(self, count, user=None):
+        tasks = []
+        for i in range(count):
+            task = Task.objects.create(
+                title=f"Задача {i}", user=user or self.user
+            )
+            task.category.set(self.categories[:1])
+            tasks.append(task)
+        return tasks
+
+    def bulk_url(self, name):
+        return f"/api/tasks/{name}/?owner_tg_id={self.TELEGRAM_ID}"
+
+    def test_bulk_create(self):
+        payload = {
+            "owner_tg_id": self.TELEGRAM_ID,
+            "tasks": [
+                {"title": f"Задача {i}", "category": [self.categories[0].id]}
+                for i in range(2)
+            ],
+        }
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                "/api/tasks/bulk_create/", payload, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        payload["tasks"] *= 10
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                "/api/tasks/bulk_create/", payload, format="json"
+            )
+        self.assertEqual(len(response.data["tasks"]), 20)
+        self.assertEqual(self.user.tasks.count(), 22)
+
+    def test_bulk_create_rejects_unknown_category(self):
+        response = self.client.post(
+            "/api/tasks/bulk_create/",
+            {
+                "owner_tg_id": self.TELEGRAM_ID,
+                "tasks": [{"title": "Задача", "category": [999]}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(self.user.tasks.exists())
+
+    def test_bulk_complete(self):
+        tasks = self.create_tasks(10)
+        foreign = self.create_tasks(1, user=self.other)[0]
+        ids = [task.id for task in tasks] + [foreign.id]
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                self.bulk_url("bulk_complete"), {"ids": ids}, format="json"
+            )
+        self.assertEqual(response.data["updated"], 10)
+        self.assertEqual(len(response.data["tasks"]), 10)
+        self.assertEqual(
+            self.user.tasks.filter(completed=True).count(), 10
+        )
+        foreign.refresh_from_db()
+        self.assertFalse(foreign.completed)
+
+    def test_bulk_delete(self):
+        tasks = self.create_tasks(10)
+        foreign = self.create_tasks(1, user=self.other)[0]
+        ids = [task.id for task in tasks] + [foreign.id]
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                self.bulk_url("bulk_delete"), {"ids": ids}, format="json"
+            )
+        self.assertEqual(response.data["deleted"], 10)
+        self.assertFalse(self.user.tasks.exists())
+        self.assertTrue(Task.objects.filter(id=foreign.id).exists())
+
+    def test_bulk_complete_rejects_invalid_ids(self):
+        response = self.client.post(
+            self.bulk_url("bulk_complete"), {"ids": ["x", 1]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("0", response.json()["ids"])
+
+    def test_bulk_set_category(self):
+        tasks = self.create_tasks(10)
+        new_category = self.categories[1]
+        with self.assertNumQueries(8):
+            response = self.client.post(
+                self.bulk_url("bulk_set_category"),
+                {
+                    "ids": [task.id for task in tasks],
+                    "category": [new_category.id],
+                    "replace": True,
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for task in response.data["tasks"]:
+            self.assertEqual(task["category"], [new_category.id])
+
+
+class FastJSONTests(SimpleTestCase):
+    """Проверяет, что JSON на orjson совпадает с JSON DRF."""
+
+    DATA = {
+        "results": [
+            {"id": 1, "title": "Задача\u2028строка", "price": Decimal("1.5")},
+            {"id": 2, "title": "Задача", "due_date": None},
+        ],
+        "next": None,
+    }
+
+    def test_renderer_matches_drf(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.DATA),
+            JSONRenderer().render(self.DATA),
+        )
+        self.assertEqual(
+            FastJSONRenderer().render(
+                self.DATA, "application/json; indent=4"
+            ),
+            JSONRenderer().render(self.DATA, "application/json; indent=4"),
+        )
+
+    def test_renderer_non_str_keys(self):
+        errors = {"ids": {0: ["Требуется целочисленное значение."]}}
+        self.assertEqual(
+            FastJSONRenderer().render(errors), JSONRenderer().render(errors)
+        )
+
+    def test_parser_matches_drf(self):
+        body = JSONRenderer().render(self.DATA)
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
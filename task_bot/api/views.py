@@ -1,27 +1,375 @@
-from rest_framework import viewsets
+from datetime import datetime, time
 
-from api.serializers import CategorySerializer, TaskSerializer, UserSerializer
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from api.pagination import TaskCursorPagination
+from api.serializers import (TASK_LIST_FIELDS, TASK_LIST_VALUES,
+                             CategorySerializer, TaskBulkCategorySerializer,
+                             TaskBulkCreateSerializer, TaskIdsSerializer,
+                             TaskSerializer, UserSerializer,
+                             add_category_names, aserialize_task_rows,
+                             serialize_task_rows, task_list_values)
 from bot.models import Category, Task, User
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+def parse_bool_param(params, name):
+    """Разбирает булев query-параметр, None если он не передан."""
+    value = params.get(name)
+    if value is None or value == '':
+        return None
+    if value in serializers.BooleanField.TRUE_VALUES:
+        return True
+    if value in serializers.BooleanField.FALSE_VALUES:
+        return False
+    raise serializers.ValidationError(
+        {name: f"Ожидалось true или false, получено '{value}'."}
+    )
+
+
+def parse_datetime_param(params, name, end_of_day=False):
+    """
+    Разбирает query-параметр с датой или датой и временем,
+    None если он не передан.
+
+    Дата без времени превращается в начало дня, а при end_of_day —
+    в его конец, чтобы граница диапазона включала весь день.
+    """
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+        if day is not None:
+            parsed = datetime.combine(
+                day, time.max if end_of_day else time.min
+            )
+        else:
+            parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise serializers.ValidationError(
+            {name: f"Неверный формат даты: '{value}'."}
+        )
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_id_list_param(params, name):
+    """Разбирает список ID через запятую, None если он не передан."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return [int(item) for item in value.split(',') if item]
+    except ValueError:
+        raise serializers.ValidationError(
+            {name: f"Ожидался список ID через запятую, получено '{value}'."}
+        )
+
+
+def parse_fields_param(params, name, allowed):
+    """
+    Разбирает список полей через запятую, None если он не передан.
+    Неизвестные поля — ошибка валидации.
+    """
+    value = params.get(name)
+    if not value:
+        return None
+    fields = [item for item in value.split(',') if item]
+    unknown = [item for item in fields if item not in allowed]
+    if unknown:
+        raise serializers.ValidationError(
+            {name: f"Неизвестные поля: {', '.join(unknown)}."}
+        )
+    return fields or None
+
+
+class SparseFieldsViewMixin:
+    """
+    Параметр fields=<поле>[,<поле>...] для списка и просмотра объекта:
+    в ответ попадают только перечисленные поля из sparse_fields,
+    а get_queryset выбирает только нужные для них столбцы.
+    """
+
+    sparse_fields = ()
+
+    def get_sparse_fields(self):
+        if self.action not in ('list', 'retrieve'):
+            return None
+        return parse_fields_param(
+            self.request.query_params, 'fields', self.sparse_fields
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_sparse_fields()
+        return context
+
+
+class AsyncModelViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    mixins.ListModelMixin,
+    AsyncGenericViewSet,
+):
+    """
+    ModelViewSet на adrf: действия, объявленные через async def,
+    выполняются в цикле событий ASGI-сервера, а синхронные (запись,
+    массовые операции) adrf запускает в потоке через sync_to_async.
+    """
+
+
+class TaskViewSet(SparseFieldsViewMixin, AsyncModelViewSet):
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
+    sparse_fields = tuple(TASK_LIST_FIELDS)
+    fast_list = True
+
+    async def list(self, request, *args, **kwargs):
+        """
+        Отдаёт список задач в формате TaskSerializer, но читает строки
+        через values() и собирает JSON без ModelSerializer.
+
+        Запись (create/update) по-прежнему проходит полную валидацию
+        TaskSerializer. При fast_list = False используется обычный путь.
+        """
+        if not self.fast_list:
+            return await sync_to_async(super().list)(
+                request, *args, **kwargs
+            )
+        fields = self.get_sparse_fields()
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(
+            *task_list_values(fields)
+        )
+        page = await self.apaginate_queryset(rows)
+        if page is None:
+            page = [row async for row in rows]
+            return Response(await aserialize_task_rows(page, fields))
+        return self.get_paginated_response(
+            await aserialize_task_rows(page, fields)
+        )
+
+    async def retrieve(self, request, *args, **kwargs):
+        """Отдаёт задачу в том же формате, что и список."""
+        fields = self.get_sparse_fields()
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            rows = [
+                row async for row in queryset.prefetch_related(None).filter(
+                    **{self.lookup_field: kwargs[lookup]}
+                ).values(*task_list_values(fields))
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if not rows:
+            raise Http404
+        return Response((await aserialize_task_rows(rows, fields))[0])
 
     def get_queryset(self):
         """
         Фильтрует задачи на основе параметра 'owner_tg_id',
         переданного в URL.
+
+        Дополнительно поддерживает фильтры:
+        completed=true|false, due_date_after, due_date_before
+        (дата или дата со временем, границы включаются) и
+        category=<id>[,<id>...].
+
+        Автор подгружается тем же JOIN, что и фильтр по telegram_id,
+        а категории — одним дополнительным запросом на всю выборку.
+        """
+        params = self.request.query_params
+        telegram_id = params.get('owner_tg_id')
+        if not telegram_id:
+            return Task.objects.none()
+        fields = self.get_sparse_fields()
+        queryset = Task.objects.filter(user__telegram_id=telegram_id)
+        if fields:
+            queryset = queryset.only(*task_list_values(fields))
+        if not fields or 'user' in fields:
+            queryset = queryset.select_related('user')
+        if self.action in (
+            'list', 'retrieve', 'update', 'partial_update'
+        ) and (not fields or 'category' in fields):
+            queryset = queryset.prefetch_related(
+                Prefetch('category', queryset=Category.objects.only('id'))
+            )
+
+        completed = parse_bool_param(params, 'completed')
+        if completed is not None:
+            queryset = queryset.filter(completed=completed)
+
+        due_date_after = parse_datetime_param(params, 'due_date_after')
+        if due_date_after is not None:
+            queryset = queryset.filter(due_date__gte=due_date_after)
+
+        due_date_before = parse_datetime_param(
+            params, 'due_date_before', end_of_day=True
+        )
+        if due_date_before is not None:
+            queryset = queryset.filter(due_date__lte=due_date_before)
+
+        category_ids = parse_id_list_param(params, 'category')
+        if category_ids:
+            queryset = queryset.filter(
+                category__in=category_ids
+            ).distinct()
+        return queryset
+
+    def owned_tasks(self, ids):
+        """
+        Задачи из списка ids, принадлежащие пользователю owner_tg_id.
+        Фильтры списка на массовые операции не влияют.
         """
         telegram_id = self.request.query_params.get('owner_tg_id')
+        if not telegram_id:
+            return Task.objects.none()
+        return Task.objects.filter(user__telegram_id=telegram_id, id__in=ids)
+
+    def tasks_response(self, queryset, **extra):
+        """Отдаёт задачи из queryset в формате списка."""
+        rows = queryset.values(*TASK_LIST_VALUES)
+        return {**extra, 'tasks': serialize_task_rows(rows)}
+
+    @action(detail=False, methods=['get'])
+    async def main_menu(self, request):
+        """
+        Всё для главного меню бота за один запрос и четыре запроса
+        к базе: страница активных задач с названиями категорий
+        (category_names), список категорий и число активных
+        и выполненных задач. Страница пагинируется так же, как список.
+        """
+        telegram_id = request.query_params.get('owner_tg_id')
+        counts = {'active': 0, 'completed': 0}
         if telegram_id:
-            return Task.objects.filter(user__telegram_id=telegram_id)
-        return Task.objects.none()
+            counts = await Task.objects.filter(
+                user__telegram_id=telegram_id
+            ).aaggregate(
+                active=Count('id', filter=Q(completed=False)),
+                completed=Count('id', filter=Q(completed=True)),
+            )
+        rows = self.get_queryset().filter(completed=False).prefetch_related(
+            None
+        ).values(*TASK_LIST_VALUES)
+        page = await self.apaginate_queryset(rows)
+        tasks = self.get_paginated_response(
+            await aserialize_task_rows(page)
+        ).data
+        categories = [
+            category async for category in
+            Category.objects.values('id', 'name', 'slug')
+        ]
+        add_category_names(tasks['results'], categories)
+        return Response(
+            {'tasks': tasks, 'categories': categories, 'counts': counts}
+        )
 
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """Создаёт несколько задач одного пользователя за один запрос."""
+        serializer = TaskBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        tasks = serializer.save()
+        return Response(
+            self.tasks_response(
+                Task.objects.filter(id__in=[task.id for task in tasks])
+            ),
+            status=status.HTTP_201_CREATED,
+        )
 
-class CategoryViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def bulk_complete(self, request):
+        """
+        Отмечает задачи из списка ids выполненными одним UPDATE.
+        Задачи других пользователей пропускаются.
+        """
+        serializer = TaskIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            updated = self.owned_tasks(ids).update(completed=True)
+        return Response(
+            self.tasks_response(self.owned_tasks(ids), updated=updated)
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Удаляет задачи из списка ids в одной транзакции."""
+        serializer = TaskIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            _, deleted = self.owned_tasks(ids).delete()
+        return Response({'deleted': deleted.get(Task._meta.label, 0)})
+
+    @action(detail=False, methods=['post'])
+    def bulk_set_category(self, request):
+        """
+        Добавляет задачам из списка ids категории из category,
+        а при replace=true заменяет ими текущие.
+        """
+        serializer = TaskBulkCategorySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        through = Task.category.through
+        with transaction.atomic():
+            task_ids = list(
+                self.owned_tasks(data['ids']).values_list('id', flat=True)
+            )
+            if data['replace']:
+                through.objects.filter(task_id__in=task_ids).delete()
+            through.objects.bulk_create(
+                (
+                    through(task_id=task_id, category_id=category.id)
+                    for task_id in task_ids
+                    for category in data['category']
+                ),
+                ignore_conflicts=True,
+            )
+        return Response(
+            self.tasks_response(
+                Task.objects.filter(id__in=task_ids), updated=len(task_ids)
+            )
+        )
+
+
+class CategoryViewSet(SparseFieldsViewMixin, AsyncModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     http_method_names = ["get", "post", "put", "delete"]
+    sparse_fields = ("id", "name", "slug")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields:
+            queryset = queryset.only(*fields)
+        return queryset
+
+    async def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        categories = [category async for category in queryset]
+        return Response(self.get_serializer(categories, many=True).data)
+
+    async def retrieve(self, request, *args, **kwargs):
+        category = await self.aget_object()
+        return Response(self.get_serializer(category).data)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -1,28 +1,665 @@
+import asyncio
 import logging
+from abc import ABC, abstractmethod
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+from urllib.parse import parse_qs, urlsplit
 
 import aiohttp
 from rest_framework import status
 
-from bot.config import config
+from bot.cache import (CategoryEntry, MainMenuPage, TaskPage, TaskSnapshot,
+                       TTLCache)
+from bot.config import Config, config
+from bot.json_codec import dumps, loads
+from bot.storage import SharedVersions
 
 BASE_URL = config.api.base_url
+MAX_PAGE_SIZE = 100
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+T = TypeVar("T")
 
-async def get_categories(telegram_user_id: int) -> Optional[List[Dict]]:
-    """Получает список категорий пользователя."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{BASE_URL}categories/", params={"user": telegram_user_id}
+
+async def _read_json(response: aiohttp.ClientResponse):
+    """
+    Разбирает тело ответа из байтов через bot.json_codec, без
+    промежуточного декодирования в строку, как в response.json().
+    """
+    return loads(await response.read())
+
+
+def _cursor_from_url(url: Optional[str]) -> Optional[str]:
+    """Достаёт курсор из ссылки next/previous курсорной пагинации."""
+    if not url:
+        return None
+    return parse_qs(urlsplit(url).query).get("cursor", [None])[0]
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные одинаковые запросы в один.
+
+    Пока запрос с некоторым ключом выполняется, остальные вызовы с тем же
+    ключом не идут в backend, а ждут его результат.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Выполняет func() или присоединяется к уже идущему вызову."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        self.calls += 1
+        future = asyncio.ensure_future(func())
+        self._in_flight[key] = future
+
+        def _forget(done: asyncio.Future) -> None:
+            if self._in_flight.get(key) is done:
+                del self._in_flight[key]
+
+        future.add_done_callback(_forget)
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает число выполненных и объединённых вызовов."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+class DataClient(ABC):
+    """
+    Доступ бота к задачам и категориям.
+
+    Здесь живут кеш категорий, снимки страниц задач и объединение
+    одинаковых запросов. Сами данные загружает и меняет подкласс:
+    ApiClient ходит в backend по HTTP, OrmClient из bot.orm_client —
+    напрямую в базу через асинхронный ORM Django. Методы _fetch_*,
+    _create_task, _update_task, _delete_task и _bulk_* возвращают
+    задачи в формате JSON списка задач API.
+
+    Снимки задач и счётчики живут в памяти процесса. Если реплик бота
+    несколько (BOT_MODE=webhook), versions связывает их: перед чтением
+    из снимка версия задач пользователя сверяется с общей в Redis,
+    а после изменения общая версия увеличивается.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 10,
+        category_cache_ttl: float = 600.0,
+        category_cache_maxsize: int = 1024,
+        task_snapshot_ttl: float = 120.0,
+        task_snapshot_maxsize: int = 1000,
+        versions: Optional[SharedVersions] = None,
+    ):
+        self.page_size = page_size
+        self.category_cache = TTLCache(
+            maxsize=category_cache_maxsize, ttl=category_cache_ttl
+        )
+        self.task_snapshots = TTLCache(
+            maxsize=task_snapshot_maxsize, ttl=task_snapshot_ttl
+        )
+        self.task_counts = TTLCache(
+            maxsize=task_snapshot_maxsize, ttl=task_snapshot_ttl
+        )
+        # Версия общих данных, которой соответствуют снимки и счётчики
+        # пользователя в этом процессе.
+        self.task_versions = TTLCache(
+            maxsize=task_snapshot_maxsize, ttl=task_snapshot_ttl
+        )
+        self.versions = versions
+        self.single_flight = SingleFlight()
+
+    @staticmethod
+    def cache_options(settings: Config) -> Dict:
+        """
+        Настройки страниц и кешей, общие для всех реализаций.
+
+        В режиме webhook реплик может быть несколько, и снимки задач
+        сверяются через Redis из FSM_REDIS_DSN (по умолчанию
+        REDIS_DSN). Без Redis снимки в этом режиме отключаются.
+        """
+        options = {
+            "page_size": settings.api.page_size,
+            "category_cache_ttl": settings.cache.category_ttl,
+            "category_cache_maxsize": settings.cache.category_maxsize,
+            "task_snapshot_ttl": settings.cache.task_snapshot_ttl,
+            "task_snapshot_maxsize": settings.cache.task_snapshot_maxsize,
+        }
+        if settings.bot.mode == "webhook":
+            if settings.storage.redis_dsn:
+                options["versions"] = SharedVersions.from_url(
+                    settings.storage.redis_dsn
+                )
+            else:
+                logging.warning(
+                    "BOT_MODE=webhook без Redis: снимки задач отключены."
+                )
+                options["task_snapshot_ttl"] = 0
+        return options
+
+    async def start(self) -> None:
+        """Готовит подключения заранее, при старте бота."""
+
+    async def close(self) -> None:
+        """Закрывает подключения."""
+        if self.versions is not None:
+            await self.versions.close()
+
+    async def _get_category_entry(
+        self, telegram_user_id: int
+    ) -> Optional[CategoryEntry]:
+        """Возвращает категории из кеша, при промахе загружает их."""
+        entry = self.category_cache.get(telegram_user_id)
+        if entry is None:
+            categories = await self.single_flight.do(
+                ("categories", telegram_user_id),
+                lambda: self._fetch_categories(telegram_user_id),
+            )
+            if categories is None:
+                return None
+            entry = CategoryEntry.from_list(categories)
+            self.category_cache.set(telegram_user_id, entry)
+        return entry
+
+    async def get_categories(
+        self, telegram_user_id: int
+    ) -> Optional[List[Dict]]:
+        """Получает список категорий пользователя."""
+        entry = await self._get_category_entry(telegram_user_id)
+        return entry.items if entry is not None else None
+
+    async def get_category_names(
+        self, telegram_user_id: int
+    ) -> Dict[int, str]:
+        """Возвращает словарь {id категории: название} из кеша."""
+        entry = await self._get_category_entry(telegram_user_id)
+        return entry.names if entry is not None else {}
+
+    def invalidate_categories(
+        self, telegram_user_id: Optional[int] = None
+    ) -> None:
+        """
+        Сбрасывает кеш категорий пользователя,
+        а без аргумента — кеш всех пользователей.
+        """
+        self.category_cache.invalidate(telegram_user_id)
+
+    async def get_tasks_page(
+        self,
+        telegram_user_id: int,
+        completed: bool,
+        cursor: Optional[str] = None,
+    ) -> Optional[TaskPage]:
+        """
+        Получает страницу активных или выполненных задач пользователя.
+
+        Загруженные страницы хранятся в снимке пользователя, поэтому
+        повторный показ той же страницы не обращается к backend.
+        """
+        await self._sync_tasks(telegram_user_id)
+        key = (telegram_user_id, completed)
+        snapshot = self.task_snapshots.get(key)
+        if snapshot is not None and cursor in snapshot.pages:
+            return snapshot.pages[cursor]
+        filters = {"completed": completed, "page_size": self.page_size}
+        if cursor:
+            filters["cursor"] = cursor
+        data = await self._load_tasks(telegram_user_id, filters)
+        if data is None:
+            return None
+        return self._store_page(key, cursor, data)
+
+    def _store_page(
+        self, key: tuple, cursor: Optional[str], data: Dict
+    ) -> TaskPage:
+        """Кладёт загруженную страницу задач в снимок пользователя."""
+        page = TaskPage(
+            tasks=data["results"],
+            next_cursor=data["next_cursor"],
+            previous_cursor=data["previous_cursor"],
+        )
+        snapshot = self.task_snapshots.peek(key)
+        if snapshot is None:
+            snapshot = TaskSnapshot()
+            self.task_snapshots.set(key, snapshot)
+        snapshot.pages[cursor] = page
+        return page
+
+    async def get_main_menu(
+        self, telegram_user_id: int, cursor: Optional[str] = None
+    ) -> Optional[MainMenuPage]:
+        """
+        Получает страницу активных задач, названия категорий и число
+        задач для главного меню.
+
+        Если страница, категории и счётчики есть в кеше, обращения
+        к backend нет, иначе всё загружается одним запросом и заодно
+        обновляет кеш категорий и снимок задач.
+        """
+        await self._sync_tasks(telegram_user_id)
+        key = (telegram_user_id, False)
+        snapshot = self.task_snapshots.get(key)
+        entry = self.category_cache.peek(telegram_user_id)
+        counts = self.task_counts.get(telegram_user_id)
+        if (
+            snapshot is not None and cursor in snapshot.pages
+            and entry is not None and counts is not None
+        ):
+            page = snapshot.pages[cursor]
+        else:
+            data = await self.single_flight.do(
+                ("main_menu", telegram_user_id, cursor),
+                lambda: self._fetch_main_menu(telegram_user_id, cursor),
+            )
+            if data is None:
+                return None
+            entry = CategoryEntry.from_list(data["categories"])
+            self.category_cache.set(telegram_user_id, entry)
+            counts = data["counts"]
+            self.task_counts.set(telegram_user_id, counts)
+            page = self._store_page(key, cursor, data)
+        return MainMenuPage(
+            tasks=page.tasks,
+            next_cursor=page.next_cursor,
+            previous_cursor=page.previous_cursor,
+            category_names=entry.names,
+            counts=counts,
+        )
+
+    async def get_tasks(
+        self,
+        telegram_user_id: int,
+        completed: Optional[bool] = None,
+        due_date_after: Optional[date] = None,
+        due_date_before: Optional[date] = None,
+        category: Optional[int] = None,
+    ) -> Optional[List[Dict]]:
+        """
+        Получает все задачи пользователя, проходя по страницам.
+
+        Фильтры применяются на стороне backend.
+        """
+        filters = {
+            "completed": completed,
+            "due_date_after": due_date_after,
+            "due_date_before": due_date_before,
+            "category": category,
+            "page_size": MAX_PAGE_SIZE,
+        }
+        filters = {
+            name: value for name, value in filters.items()
+            if value is not None
+        }
+        tasks = []
+        cursor = None
+        while True:
+            page_filters = dict(filters, cursor=cursor) if cursor else filters
+            data = await self._load_tasks(telegram_user_id, page_filters)
+            if data is None:
+                return None
+            tasks.extend(data["results"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return tasks
+
+    def invalidate_tasks(self, telegram_user_id: Optional[int] = None) -> None:
+        """Сбрасывает снимки задач пользователя или всех пользователей."""
+        self.task_counts.invalidate(telegram_user_id)
+        if telegram_user_id is None:
+            self.task_snapshots.invalidate()
+            return
+        for completed in (False, True):
+            self.task_snapshots.invalidate((telegram_user_id, completed))
+
+    async def _sync_tasks(self, telegram_user_id: int) -> None:
+        """
+        Сбрасывает снимки и счётчики пользователя, если его задачи
+        изменила другая реплика. Без versions ничего не делает.
+        """
+        if self.versions is None:
+            return
+        try:
+            version = await self.versions.get(telegram_user_id)
+        except Exception as e:
+            logging.error(f"Не удалось получить версию задач: {e}")
+            self.invalidate_tasks(telegram_user_id)
+            self.task_versions.invalidate(telegram_user_id)
+            return
+        if self.task_versions.peek(telegram_user_id) != version:
+            self.invalidate_tasks(telegram_user_id)
+            self.task_versions.set(telegram_user_id, version)
+
+    async def _tasks_changed(self, telegram_user_id: int) -> bool:
+        """
+        Отмечает изменение задач пользователя для всех реплик.
+
+        Возвращает True, если снимки этого процесса можно обновить на
+        месте. Если между чтением и записью задачи меняла другая
+        реплика, снимки сбрасываются, и возвращается False.
+        """
+        self.task_counts.invalidate(telegram_user_id)
+        if self.versions is None:
+            return True
+        known = self.task_versions.peek(telegram_user_id)
+        try:
+            version = await self.versions.bump(telegram_user_id)
+        except Exception as e:
+            logging.error(f"Не удалось обновить версию задач: {e}")
+            self.invalidate_tasks(telegram_user_id)
+            self.task_versions.invalidate(telegram_user_id)
+            return False
+        self.task_versions.set(telegram_user_id, version)
+        if known is not None and version == known + 1:
+            return True
+        self.invalidate_tasks(telegram_user_id)
+        return False
+
+    def _loaded_snapshots(self, telegram_user_id: int):
+        """Возвращает загруженные снимки пользователя по статусу задач."""
+        for completed in (False, True):
+            snapshot = self.task_snapshots.peek((telegram_user_id, completed))
+            if snapshot is not None:
+                yield completed, snapshot
+
+    def _update_snapshot(self, telegram_user_id: int, task: Dict) -> None:
+        """
+        Кладёт задачу в снимок с её статусом и убирает из снимка
+        с противоположным.
+        """
+        for completed, snapshot in self._loaded_snapshots(telegram_user_id):
+            if task["completed"] == completed:
+                snapshot.upsert(task)
+            else:
+                snapshot.remove(task["id"])
+
+    def _remove_from_snapshot(self, telegram_user_id: int, task_id: int):
+        """Удаляет задачу из всех снимков пользователя."""
+        for _, snapshot in self._loaded_snapshots(telegram_user_id):
+            snapshot.remove(task_id)
+
+    async def _load_tasks(
+        self, telegram_user_id: int, filters: Dict
+    ) -> Optional[Dict]:
+        """
+        Загружает страницу задач, объединяя одинаковые одновременные
+        запросы.
+        """
+        return await self.single_flight.do(
+            ("tasks", telegram_user_id, *sorted(filters.items())),
+            lambda: self._fetch_tasks(telegram_user_id, filters),
+        )
+
+    async def get_task_by_id(
+        self, task_id: int, user_id: int
+    ) -> Optional[Dict]:
+        """Получает задачу по её ID, по возможности из снимка."""
+        await self._sync_tasks(user_id)
+        for _, snapshot in self._loaded_snapshots(user_id):
+            task = snapshot.get(task_id)
+            if task is not None:
+                return task
+        task = await self.single_flight.do(
+            ("task", user_id, task_id),
+            lambda: self._fetch_task(task_id, user_id),
+        )
+        if task is not None:
+            self._update_snapshot(user_id, task)
+        return task
+
+    async def add_task(
+        self,
+        telegram_user_id: int,
+        title: str,
+        category_id: int,
+        description: Optional[str] = None,
+        due_date: Optional[date] = None,
+    ) -> bool:
+        """Добавляет новую задачу."""
+        payload = {"title": title, "category": [category_id]}
+        if description:
+            payload["description"] = description
+        if due_date:
+            if isinstance(due_date, str):
+                try:
+                    due_date = date.fromisoformat(due_date)
+                except ValueError:
+                    logging.error(
+                        f"Неверный формат даты в строке: {due_date}"
+                    )
+                    return False
+            payload["due_date"] = due_date
+        task = await self._create_task(telegram_user_id, payload)
+        if task is None:
+            return False
+        logging.info(f"Задача '{title}' успешно создана.")
+        if await self._tasks_changed(telegram_user_id):
+            self._update_snapshot(telegram_user_id, task)
+        return True
+
+    async def delete_task(self, task_id: int, user_id: int) -> bool:
+        """
+        Удаляет задачу по её ID.
+        """
+        if not await self._delete_task(task_id, user_id):
+            return False
+        logging.info(f"Задача {task_id} успешно удалена.")
+        if await self._tasks_changed(user_id):
+            self._remove_from_snapshot(user_id, task_id)
+        return True
+
+    async def complete_task(self, user_id: int, task_id: int) -> bool:
+        """
+        Отмечает задачу как выполненную.
+        """
+        task = await self._update_task(task_id, user_id, {"completed": True})
+        if task is None:
+            return False
+        logging.info(f"Задача {task_id} отмечена как выполненная.")
+        if await self._tasks_changed(user_id):
+            self._update_snapshot(user_id, task)
+        return True
+
+    async def bulk_complete_tasks(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[int]:
+        """
+        Отмечает несколько задач выполненными одним запросом.
+        Возвращает число обновлённых задач.
+        """
+        data = await self._bulk_complete(user_id, task_ids)
+        if data is None:
+            return None
+        if await self._tasks_changed(user_id):
+            for task in data["tasks"]:
+                self._update_snapshot(user_id, task)
+        logging.info(
+            f"Отмечено выполненными задач: {data['updated']} "
+            f"(пользователь {user_id})."
+        )
+        return data["updated"]
+
+    async def bulk_delete_tasks(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[int]:
+        """
+        Удаляет несколько задач одним запросом.
+        Возвращает число удалённых задач.
+        """
+        deleted = await self._bulk_delete(user_id, task_ids)
+        if deleted is None:
+            return None
+        if await self._tasks_changed(user_id):
+            for task_id in task_ids:
+                self._remove_from_snapshot(user_id, task_id)
+        logging.info(f"Удалено задач: {deleted} (пользователь {user_id}).")
+        return deleted
+
+    @abstractmethod
+    async def _fetch_categories(
+        self, telegram_user_id: int
+    ) -> Optional[List[Dict]]:
+        ...
+
+    @abstractmethod
+    async def _fetch_tasks(
+        self, telegram_user_id: int, filters: Dict
+    ) -> Optional[Dict]:
+        """
+        Загружает страницу задач. Возвращает словарь с ключами results,
+        next_cursor и previous_cursor.
+        """
+
+    @abstractmethod
+    async def _fetch_main_menu(
+        self, telegram_user_id: int, cursor: Optional[str]
+    ) -> Optional[Dict]:
+        """
+        Загружает данные главного меню. Возвращает словарь с ключами
+        страницы задач, как _fetch_tasks, а также categories и counts.
+        """
+
+    @abstractmethod
+    async def _fetch_task(self, task_id: int, user_id: int) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def _create_task(
+        self, telegram_user_id: int, payload: Dict
+    ) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def _update_task(
+        self, task_id: int, user_id: int, changes: Dict
+    ) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    async def _delete_task(self, task_id: int, user_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def _bulk_complete(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[Dict]:
+        """Возвращает словарь с ключами updated и tasks."""
+
+    @abstractmethod
+    async def _bulk_delete(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[int]:
+        ...
+
+
+class ApiClient(DataClient):
+    """
+    Клиент backend API с общим пулом соединений.
+
+    Одна сессия aiohttp живёт всё время работы бота, поэтому соединения
+    с backend переиспользуются (keep-alive), а DNS-ответы кешируются.
+
+    aiohttp сам запрашивает сжатые ответы (gzip, deflate, а при
+    установленном Brotli и br) и распаковывает их. accept_encoding
+    заменяет этот список, например "identity" отключает сжатие.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 30,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        total_timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+        accept_encoding: str = "",
+        **cache_options,
+    ):
+        super().__init__(**cache_options)
+        self.base_url = base_url
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, connect=connect_timeout
+        )
+        self.accept_encoding = accept_encoding
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_config(cls, settings: Config) -> "ApiClient":
+        """Создаёт клиент по настройкам из bot.config."""
+        api_config = settings.api
+        return cls(
+            base_url=api_config.base_url,
+            connection_limit=api_config.connection_limit,
+            connection_limit_per_host=api_config.connection_limit_per_host,
+            dns_cache_ttl=api_config.dns_cache_ttl,
+            keepalive_timeout=api_config.keepalive_timeout,
+            total_timeout=api_config.total_timeout,
+            connect_timeout=api_config.connect_timeout,
+            accept_encoding=api_config.accept_encoding,
+            **cls.cache_options(settings),
+        )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Возвращает общую сессию, создавая её при первом обращении."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            headers = {}
+            if self.accept_encoding:
+                headers[aiohttp.hdrs.ACCEPT_ENCODING] = self.accept_encoding
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers=headers,
+                json_serialize=dumps,
+            )
+        return self._session
+
+    async def start(self) -> None:
+        """Открывает пул соединений заранее, при старте бота."""
+        self.session
+
+    async def close(self) -> None:
+        """Закрывает сессию и все соединения пула."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        await super().close()
+
+    async def _fetch_categories(
+        self, telegram_user_id: int
+    ) -> Optional[List[Dict]]:
+        """Запрашивает список категорий у backend."""
+        try:
+            async with self.session.get(
+                f"{self.base_url}categories/",
+                params={"user": telegram_user_id},
             ) as response:
                 if response.status == status.HTTP_200_OK:
-                    return await response.json()
+                    return await _read_json(response)
 
                 logging.error(
                     "Ошибка при получении категорий для пользователя "
@@ -30,20 +667,35 @@ async def get_categories(telegram_user_id: int) -> Optional[List[Dict]]:
                     f"Статус {response.status}, Ответ: {await response.text()}"
                 )
                 return None
-    except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при получении категорий: {e}")
-        return None
-
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при получении категорий: {e}")
+            return None
 
-async def get_tasks(telegram_user_id: int) -> Optional[List[Dict]]:
-    """Получает список всех задач пользователя."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{BASE_URL}tasks/", params={"owner_tg_id": telegram_user_id}
+    async def _fetch_tasks(
+        self, telegram_user_id: int, filters: Dict
+    ) -> Optional[Dict]:
+        """Запрашивает страницу задач пользователя у backend."""
+        params = {"owner_tg_id": telegram_user_id}
+        for name, value in filters.items():
+            if isinstance(value, bool):
+                value = str(value).lower()
+            elif isinstance(value, date):
+                value = value.isoformat()
+            params[name] = value
+        try:
+            async with self.session.get(
+                f"{self.base_url}tasks/",
+                params=params,
             ) as response:
                 if response.status == status.HTTP_200_OK:
-                    return await response.json()
+                    data = await _read_json(response)
+                    return {
+                        "results": data["results"],
+                        "next_cursor": _cursor_from_url(data.get("next")),
+                        "previous_cursor": _cursor_from_url(
+                            data.get("previous")
+                        ),
+                    }
                 logging.error(
                     "Ошибка при получении задач "
                     f"для пользователя {telegram_user_id}: "
@@ -51,22 +703,55 @@ async def get_tasks(telegram_user_id: int) -> Optional[List[Dict]]:
                     f"Ответ: {await response.text()}"
                 )
                 return None
-    except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при получении списка задач: {e}")
-        return None
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при получении списка задач: {e}")
+            return None
 
+    async def _fetch_main_menu(
+        self, telegram_user_id: int, cursor: Optional[str]
+    ) -> Optional[Dict]:
+        """Запрашивает данные главного меню у backend."""
+        params = {"owner_tg_id": telegram_user_id, "page_size": self.page_size}
+        if cursor:
+            params["cursor"] = cursor
+        try:
+            async with self.session.get(
+                f"{self.base_url}tasks/main_menu/",
+                params=params,
+            ) as response:
+                if response.status == status.HTTP_200_OK:
+                    data = await _read_json(response)
+                    tasks = data["tasks"]
+                    return {
+                        "results": tasks["results"],
+                        "next_cursor": _cursor_from_url(tasks.get("next")),
+                        "previous_cursor": _cursor_from_url(
+                            tasks.get("previous")
+                        ),
+                        "categories": data["categories"],
+                        "counts": data["counts"],
+                    }
+                logging.error(
+                    "Ошибка при получении главного меню "
+                    f"для пользователя {telegram_user_id}: "
+                    f"Статус {response.status}, "
+                    f"Ответ: {await response.text()}"
+                )
+                return None
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при получении главного меню: {e}")
+            return None
 
-async def get_task_by_id(task_id: int, user_id: int) -> Optional[Dict]:
-    """Получает задачу по её ID."""
-    try:
-        params = {"owner_tg_id": user_id}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{BASE_URL}tasks/{task_id}/",
+    async def _fetch_task(self, task_id: int, user_id: int) -> Optional[Dict]:
+        """Запрашивает задачу по её ID у backend."""
+        try:
+            params = {"owner_tg_id": user_id}
+            async with self.session.get(
+                f"{self.base_url}tasks/{task_id}/",
                 params=params
             ) as response:
                 if response.status == status.HTTP_200_OK:
-                    return await response.json()
+                    return await _read_json(response)
                 elif response.status == status.HTTP_404_NOT_FOUND:
                     logging.warning(f"Задача с ID {task_id} не найдена.")
                 else:
@@ -76,47 +761,28 @@ async def get_task_by_id(task_id: int, user_id: int) -> Optional[Dict]:
                         f"Ответ: {await response.text()}"
                     )
                 return None
-    except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при получении задачи {task_id}: {e}")
-        return None
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при получении задачи {task_id}: {e}")
+            return None
 
-
-async def add_task(
-    telegram_user_id: int,
-    title: str,
-    category_id: int,
-    description: Optional[str] = None,
-    due_date: Optional[date] = None,
-) -> bool:
-    """Добавляет новую задачу."""
-    payload = {
-        "title": title,
-        "category": [category_id],
-        "owner_tg_id": telegram_user_id,
-    }
-    if description:
-        payload["description"] = description
-    if due_date:
-        if isinstance(due_date, str):
-            try:
-                actual_date = date.fromisoformat(due_date)
-            except ValueError:
-                logging.error(f"Неверный формат даты в строке: {due_date}")
-                return False
-        else:
-            actual_date = due_date
-        payload["due_date"] = actual_date.isoformat()
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{BASE_URL}tasks/", json=payload
+    async def _create_task(
+        self, telegram_user_id: int, payload: Dict
+    ) -> Optional[Dict]:
+        """Создаёт задачу через backend."""
+        title = payload["title"]
+        payload = dict(payload, owner_tg_id=telegram_user_id)
+        if "due_date" in payload:
+            payload["due_date"] = payload["due_date"].isoformat()
+        try:
+            async with self.session.post(
+                f"{self.base_url}tasks/", json=payload
             ) as response:
                 if response.status == status.HTTP_201_CREATED:
-                    logging.info(f"Задача '{title}' успешно создана.")
-                    return True
+                    return await _read_json(response)
                 elif response.status == status.HTTP_400_BAD_REQUEST:
                     logging.error(
-                        f"Ошибка добавления задачи '{title}': BAD_REQUEST_400."
+                        f"Ошибка добавления задачи '{title}': "
+                        "BAD_REQUEST_400."
                         f"Данные: {payload}, Ответ: {await response.text()}"
                     )
                 else:
@@ -125,25 +791,20 @@ async def add_task(
                         f"Статус {response.status}, "
                         f"Ответ: {await response.text()}"
                     )
-                return False
-    except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при добавлении задачи: {e}")
-        return False
-
+                return None
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при добавлении задачи: {e}")
+            return None
 
-async def delete_task(task_id: int, user_id: int) -> bool:
-    """
-    Удаляет задачу по её ID.
-    """
-    try:
-        params = {"owner_tg_id": user_id}
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(
-                f"{BASE_URL}tasks/{task_id}/",
+    async def _delete_task(self, task_id: int, user_id: int) -> bool:
+        """Удаляет задачу через backend."""
+        try:
+            params = {"owner_tg_id": user_id}
+            async with self.session.delete(
+                f"{self.base_url}tasks/{task_id}/",
                 params=params
             ) as response:
                 if response.status == status.HTTP_204_NO_CONTENT:
-                    logging.info(f"Задача {task_id} успешно удалена.")
                     return True
                 elif response.status == status.HTTP_404_NOT_FOUND:
                     logging.warning(
@@ -157,46 +818,180 @@ async def delete_task(task_id: int, user_id: int) -> bool:
                         f"Ответ: {await response.text()}"
                     )
                 return False
-    except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при удалении задачи {task_id}: {e}")
-        return False
-
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при удалении задачи {task_id}: {e}")
+            return False
 
-async def complete_task(user_id: int, task_id: int) -> bool:
-    """
-    Отмечает задачу как выполненную.
-    """
-    payload = {"completed": True}
-    try:
-        params = {"owner_tg_id": user_id}
-        async with aiohttp.ClientSession() as session:
-            async with session.patch(
-                f"{BASE_URL}tasks/{task_id}/",
-                json=payload,
+    async def _update_task(
+        self, task_id: int, user_id: int, changes: Dict
+    ) -> Optional[Dict]:
+        """Частично обновляет задачу через backend."""
+        try:
+            params = {"owner_tg_id": user_id}
+            async with self.session.patch(
+                f"{self.base_url}tasks/{task_id}/",
+                json=changes,
                 params=params
             ) as response:
                 if response.status == status.HTTP_200_OK:
-                    logging.info(
-                        f"Задача {task_id} отмечена как выполненная."
-                    )
-                    return True
+                    return await _read_json(response)
                 elif response.status == status.HTTP_404_NOT_FOUND:
                     logging.warning(
-                        f"Не удалось завершить задачу {task_id}: "
+                        f"Не удалось обновить задачу {task_id}: "
                         "не найдена."
                     )
                 elif response.status == status.HTTP_403_FORBIDDEN:
                     logging.error(
                         f"Пользователь {user_id} не имеет прав "
-                        "на завершение задачи {task_id}."
+                        f"на изменение задачи {task_id}."
                     )
                 else:
                     logging.error(
-                        f"Ошибка при завершении задачи {task_id}: "
+                        f"Ошибка при обновлении задачи {task_id}: "
                         f"Статус {response.status}, "
                         f"Ответ: {await response.text()}"
                     )
-                return False
-    except aiohttp.ClientError as e:
-        logging.error(f"Ошибка при завершении задачи {task_id}: {e}")
-        return False
+                return None
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка при обновлении задачи {task_id}: {e}")
+            return None
+
+    async def _post_bulk(
+        self, name: str, user_id: int, payload: Dict
+    ) -> Optional[Dict]:
+        """Вызывает массовую операцию над задачами пользователя."""
+        try:
+            async with self.session.post(
+                f"{self.base_url}tasks/{name}/",
+                json=payload,
+                params={"owner_tg_id": user_id},
+            ) as response:
+                if response.status in (
+                    status.HTTP_200_OK, status.HTTP_201_CREATED
+                ):
+                    return await _read_json(response)
+                logging.error(
+                    f"Ошибка массовой операции {name} "
+                    f"для пользователя {user_id}: "
+                    f"Статус {response.status}, "
+                    f"Ответ: {await response.text()}"
+                )
+                return None
+        except aiohttp.ClientError as e:
+            logging.error(f"Ошибка массовой операции {name}: {e}")
+            return None
+
+    async def _bulk_complete(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[Dict]:
+        return await self._post_bulk(
+            "bulk_complete", user_id, {"ids": task_ids}
+        )
+
+    async def _bulk_delete(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[int]:
+        data = await self._post_bulk("bulk_delete", user_id, {"ids": task_ids})
+        return data["deleted"] if data is not None else None
+
+
+def create_data_client(settings: Config) -> DataClient:
+    """
+    Создаёт клиент данных по BOT_DATA_BACKEND: http (по умолчанию)
+    или orm.
+    """
+    if settings.api.backend == "orm":
+        from bot.orm_client import OrmClient
+
+        return OrmClient.from_config(settings)
+    return ApiClient.from_config(settings)
+
+
+_api_client: Optional[DataClient] = None
+
+
+def get_api_client() -> DataClient:
+    """
+    Возвращает общий клиент данных.
+
+    Если бот ещё не зарегистрировал свой клиент через set_api_client,
+    клиент создаётся по настройкам из bot.config.
+    """
+    global _api_client
+    if _api_client is None:
+        _api_client = create_data_client(config)
+    return _api_client
+
+
+def set_api_client(client: Optional[DataClient]) -> None:
+    """Регистрирует общий клиент API (вызывается при старте бота)."""
+    global _api_client
+    _api_client = client
+
+
+async def get_categories(telegram_user_id: int) -> Optional[List[Dict]]:
+    """Получает список категорий пользователя."""
+    return await get_api_client().get_categories(telegram_user_id)
+
+
+async def get_tasks(
+    telegram_user_id: int,
+    completed: Optional[bool] = None,
+    due_date_after: Optional[date] = None,
+    due_date_before: Optional[date] = None,
+    category: Optional[int] = None,
+) -> Optional[List[Dict]]:
+    """Получает задачи пользователя с фильтрами на стороне backend."""
+    return await get_api_client().get_tasks(
+        telegram_user_id,
+        completed=completed,
+        due_date_after=due_date_after,
+        due_date_before=due_date_before,
+        category=category,
+    )
+
+
+async def get_task_by_id(task_id: int, user_id: int) -> Optional[Dict]:
+    """Получает задачу по её ID."""
+    return await get_api_client().get_task_by_id(task_id, user_id)
+
+
+async def add_task(
+    telegram_user_id: int,
+    title: str,
+    category_id: int,
+    description: Optional[str] = None,
+    due_date: Optional[date] = None,
+) -> bool:
+    """Добавляет новую задачу."""
+    return await get_api_client().add_task(
+        telegram_user_id=telegram_user_id,
+        title=title,
+        category_id=category_id,
+        description=description,
+        due_date=due_date,
+    )
+
+
+async def delete_task(task_id: int, user_id: int) -> bool:
+    """Удаляет задачу по её ID."""
+    return await get_api_client().delete_task(task_id, user_id)
+
+
+async def complete_task(user_id: int, task_id: int) -> bool:
+    """Отмечает задачу как выполненную."""
+    return await get_api_client().complete_task(user_id, task_id)
+
+
+async def bulk_complete_tasks(
+    user_id: int, task_ids: List[int]
+) -> Optional[int]:
+    """Отмечает несколько задач выполненными."""
+    return await get_api_client().bulk_complete_tasks(user_id, task_ids)
+
+
+async def bulk_delete_tasks(
+    user_id: int, task_ids: List[int]
+) -> Optional[int]:
+    """Удаляет несколько задач."""
+    return await get_api_client().bulk_delete_tasks(user_id, task_ids)
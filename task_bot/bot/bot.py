@@ -6,10 +6,13 @@ from aiogram.filters import CommandStart
 from aiogram.types import Message
 from aiogram_dialog import DialogManager, StartMode, setup_dialogs
 
+from bot.api_client import create_data_client, set_api_client
 from bot.config import config
 from bot.dialogs.add_task import add_task_dialog
 from bot.dialogs.main_menu import main_menu_dialog
 from bot.dialogs.states import MainMenu
+from bot.storage import create_events_isolation, create_storage
+from bot.webhook import run_webhook
 
 logging.basicConfig(level=logging.INFO)
 
@@ -18,21 +21,65 @@ async def start(message: Message, dialog_manager: DialogManager):
     await dialog_manager.start(MainMenu.view_tasks, mode=StartMode.RESET_STACK)
 
 
-async def main():
-    bot = Bot(token=config.bot.token)
-    dp = Dispatcher()
+async def on_startup(dispatcher: Dispatcher):
+    """
+    Открывает общий пул соединений с backend (или базой при
+    BOT_DATA_BACKEND=orm).
+    """
+    api_client = create_data_client(config)
+    await api_client.start()
+    set_api_client(api_client)
+    dispatcher["api_client"] = api_client
+
+
+async def on_shutdown(dispatcher: Dispatcher):
+    """Закрывает пул соединений с backend."""
+    api_client = dispatcher["api_client"]
+    logging.info(f"Кеш категорий: {api_client.category_cache.stats()}")
+    logging.info(
+        f"Объединение запросов: {api_client.single_flight.stats()}"
+    )
+    await api_client.close()
+    set_api_client(None)
+
+
+def create_dispatcher() -> Dispatcher:
+    storage = create_storage(config)
+    dp = Dispatcher(
+        storage=storage, events_isolation=create_events_isolation(storage)
+    )
 
     dp.include_router(main_menu_dialog)
     dp.include_router(add_task_dialog)
     setup_dialogs(dp)
 
     dp.message.register(start, CommandStart())
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+
+def main():
+    """
+    Запускает бота в режиме BOT_MODE: polling (по умолчанию) или
+    webhook, см. bot.webhook.
+    """
+    bot = Bot(token=config.bot.token)
+    dp = create_dispatcher()
 
-    await dp.start_polling(bot)
+    if config.bot.mode == "webhook":
+        run_webhook(bot, dp, config)
+        return
+    asyncio.run(
+        dp.start_polling(
+            bot,
+            tasks_concurrency_limit=config.bot.max_concurrent_updates or None,
+        )
+    )
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        main()
     except (KeyboardInterrupt, SystemExit):
         logging.info("Bot stopped")
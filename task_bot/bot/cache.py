@@ -0,0 +1,175 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    """
+    Ограниченный по размеру LRU-кеш с временем жизни записей.
+
+    Считает попадания и промахи, чтобы по ним можно было оценить,
+    сколько запросов к backend удалось сэкономить.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not None
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение без учёта в статистике и порядке LRU."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение или None, если его нет или оно устарело."""
+        value = self.peek(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение, вытесняя самые давние записи."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Удаляет запись по ключу, а без ключа очищает весь кеш."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счётчики попаданий и промахов."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+@dataclass
+class CategoryEntry:
+    """Список категорий вместе с готовым словарём {id: название}."""
+
+    items: List[Dict]
+    names: Dict[int, str]
+
+    @classmethod
+    def from_list(cls, categories: List[Dict]) -> "CategoryEntry":
+        return cls(
+            items=categories,
+            names={cat["id"]: cat.get("name", "N/A") for cat in categories},
+        )
+
+
+def _list_position(task: Dict) -> tuple:
+    """
+    Ключ порядка задач в списке backend (-created_at, id):
+    чем больше ключ, тем выше задача в списке.
+    """
+    return (task.get("created_at") or "", -task["id"])
+
+
+@dataclass
+class TaskPage:
+    """Страница списка задач и курсоры соседних страниц."""
+
+    tasks: List[Dict]
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+    def covers(self, task: Dict) -> bool:
+        """Проверяет, должна ли задача оказаться на этой странице."""
+        position = _list_position(task)
+        if self.previous_cursor is not None and (
+            not self.tasks or position > _list_position(self.tasks[0])
+        ):
+            return False
+        if self.next_cursor is not None and (
+            not self.tasks or position < _list_position(self.tasks[-1])
+        ):
+            return False
+        return True
+
+
+@dataclass
+class MainMenuPage(TaskPage):
+    """
+    Страница активных задач вместе со всем, что нужно главному меню:
+    названиями категорий и числом активных и выполненных задач.
+    """
+
+    category_names: Dict[int, str] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class TaskSnapshot:
+    """
+    Снимок загруженных страниц списка задач пользователя по курсорам.
+
+    Страницы загружаются по мере пролистывания и дальше обновляются
+    на месте при создании, выполнении и удалении задач.
+    """
+
+    pages: Dict[Optional[str], TaskPage] = field(default_factory=dict)
+
+    def get(self, task_id: int) -> Optional[Dict]:
+        for page in self.pages.values():
+            for task in page.tasks:
+                if task["id"] == task_id:
+                    return task
+        return None
+
+    def upsert(self, task: Dict) -> None:
+        """
+        Обновляет задачу на её месте, а новую вставляет в загруженную
+        страницу, в диапазон которой она попадает.
+
+        Задача ниже последней загруженной страницы со следующим
+        курсором в снимок не попадает: её принесёт загрузка следующей
+        страницы. Если же задача попала между загруженными страницами
+        (например, выполненная задача со старым created_at в списке
+        выполненных), её место не покрывает ни одна страница, и снимок
+        сбрасывается целиком, чтобы задача не пропала из списка.
+        """
+        for page in self.pages.values():
+            for index, item in enumerate(page.tasks):
+                if item["id"] == task["id"]:
+                    page.tasks[index] = task
+                    return
+        for page in self.pages.values():
+            if page.covers(task):
+                page.tasks.append(task)
+                page.tasks.sort(key=_list_position, reverse=True)
+                return
+        position = _list_position(task)
+        loaded = [page for page in self.pages.values() if page.tasks]
+        if any(
+            position < _list_position(page.tasks[-1]) for page in loaded
+        ) and any(
+            position > _list_position(page.tasks[0]) for page in loaded
+        ):
+            self.pages.clear()
+
+    def remove(self, task_id: int) -> None:
+        for page in self.pages.values():
+            page.tasks = [task for task in page.tasks if task["id"] != task_id]
@@ -13,11 +13,32 @@ load_dotenv(dotenv_path=dotenv_path)
 @dataclass
 class BotConfig:
     token: str
+    mode: str = "polling"
+    max_concurrent_updates: int = 0
+
+
+@dataclass
+class WebhookConfig:
+    base_url: str = ""
+    path: str = "/webhook"
+    secret: str = ""
+    host: str = "0.0.0.0"
+    port: int = 8080
+    max_connections: int = 40
 
 
 @dataclass
 class ApiConfig:
     base_url: str
+    backend: str = "http"
+    connection_limit: int = 100
+    connection_limit_per_host: int = 30
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30.0
+    total_timeout: float = 10.0
+    connect_timeout: float = 3.0
+    page_size: int = 10
+    accept_encoding: str = ""
 
 
 @dataclass
@@ -25,15 +46,88 @@ class RedisConfig:
     dsn: str
 
 
+@dataclass
+class StorageConfig:
+    backend: str = "memory"
+    redis_dsn: str = ""
+    state_ttl: int = 172800
+    data_ttl: int = 172800
+
+
+@dataclass
+class CacheConfig:
+    category_ttl: float = 600.0
+    category_maxsize: int = 1024
+    task_snapshot_ttl: float = 120.0
+    task_snapshot_maxsize: int = 1000
+
+
+@dataclass
+class NotificationConfig:
+    api_server: str = ""
+    global_rate: float = 30.0
+    per_chat_rate: float = 1.0
+    concurrency: int = 20
+    max_retries: int = 3
+
+
 @dataclass
 class Config:
     bot: BotConfig
+    webhook: WebhookConfig
     api: ApiConfig
     redis: RedisConfig
+    storage: StorageConfig
+    cache: CacheConfig
+    notifications: NotificationConfig
 
 
 config = Config(
-    bot=BotConfig(token=os.getenv("BOT_TOKEN")),
-    api=ApiConfig(base_url="http://backend:8000/api/"),
+    bot=BotConfig(
+        token=os.getenv("BOT_TOKEN"),
+        mode=os.getenv("BOT_MODE", "polling").lower(),
+        max_concurrent_updates=int(os.getenv("BOT_MAX_CONCURRENT_UPDATES", 0)),
+    ),
+    webhook=WebhookConfig(
+        base_url=os.getenv("WEBHOOK_BASE_URL", ""),
+        path=os.getenv("WEBHOOK_PATH", "/webhook"),
+        secret=os.getenv("WEBHOOK_SECRET", ""),
+        host=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+        port=int(os.getenv("WEBHOOK_PORT", 8080)),
+        max_connections=int(os.getenv("WEBHOOK_MAX_CONNECTIONS", 40)),
+    ),
+    api=ApiConfig(
+        base_url=os.getenv("API_BASE_URL", "http://backend:8000/api/"),
+        backend=os.getenv("BOT_DATA_BACKEND", "http").lower(),
+        connection_limit=int(os.getenv("API_CONNECTION_LIMIT", 100)),
+        connection_limit_per_host=int(
+            os.getenv("API_CONNECTION_LIMIT_PER_HOST", 30)
+        ),
+        dns_cache_ttl=int(os.getenv("API_DNS_CACHE_TTL", 300)),
+        keepalive_timeout=float(os.getenv("API_KEEPALIVE_TIMEOUT", 30)),
+        total_timeout=float(os.getenv("API_TOTAL_TIMEOUT", 10)),
+        connect_timeout=float(os.getenv("API_CONNECT_TIMEOUT", 3)),
+        page_size=int(os.getenv("TASKS_PAGE_SIZE", 10)),
+        accept_encoding=os.getenv("API_ACCEPT_ENCODING", ""),
+    ),
     redis=RedisConfig(dsn=os.getenv("REDIS_DSN")),
+    storage=StorageConfig(
+        backend=os.getenv("FSM_STORAGE", "memory").lower(),
+        redis_dsn=os.getenv("FSM_REDIS_DSN", os.getenv("REDIS_DSN", "")),
+        state_ttl=int(os.getenv("FSM_STATE_TTL", 172800)),
+        data_ttl=int(os.getenv("FSM_DATA_TTL", 172800)),
+    ),
+    cache=CacheConfig(
+        category_ttl=float(os.getenv("CATEGORY_CACHE_TTL", 600)),
+        category_maxsize=int(os.getenv("CATEGORY_CACHE_MAXSIZE", 1024)),
+        task_snapshot_ttl=float(os.getenv("TASK_SNAPSHOT_TTL", 120)),
+        task_snapshot_maxsize=int(os.getenv("TASK_SNAPSHOT_MAXSIZE", 1000)),
+    ),
+    notifications=NotificationConfig(
+        api_server=os.getenv("TELEGRAM_API_SERVER", ""),
+        global_rate=float(os.getenv("NOTIFY_GLOBAL_RATE", 30)),
+        per_chat_rate=float(os.getenv("NOTIFY_PER_CHAT_RATE", 1)),
+        concurrency=int(os.getenv("NOTIFY_CONCURRENCY", 20)),
+        max_retries=int(os.getenv("NOTIFY_MAX_RETRIES", 3)),
+    ),
 )
@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date
 from typing import Union
 
 from aiogram.types import CallbackQuery, Message
@@ -8,7 +8,7 @@ from aiogram_dialog.widgets.kbd import (Back, Button, Calendar, Column, Group,
                                         Select, Start, SwitchTo)
 from aiogram_dialog.widgets.text import Const, Format
 
-from bot.api_client import add_task, get_categories
+from bot.api_client import DataClient
 
 from .states import AddTask, MainMenu
 
@@ -24,18 +24,27 @@ async def on_task_selected(
     await manager.switch_to(MainMenu.details)
 
 
-async def categories_getter(dialog_manager: DialogManager, **kwargs):
-    """Загружает категории для выбора."""
-    categories = await get_categories(
+async def categories_getter(
+    dialog_manager: DialogManager, api_client: DataClient, **kwargs
+):
+    """
+    Загружает категории для выбора. Сам список в dialog_data
+    не сохраняется: он есть в кеше категорий DataClient.
+    """
+    categories = await api_client.get_categories(
         telegram_user_id=dialog_manager.event.from_user.id
-    )
-    dialog_manager.dialog_data["full_categories_list"] = categories
+    ) or []
     category_list = [(cat["name"], cat["id"]) for cat in categories]
     return {"categories": category_list}
 
 
-async def success_getter(dialog_manager: DialogManager, **kwargs):
+async def success_getter(
+    dialog_manager: DialogManager, api_client: DataClient, **kwargs
+):
     """Подготавливает данные для финального экрана."""
+    categories_map = await api_client.get_category_names(
+        dialog_manager.event.from_user.id
+    )
     due_date = dialog_manager.dialog_data.get("task_due_date")
     due_date_str = "не указан"
     if due_date:
@@ -43,8 +52,8 @@ async def success_getter(dialog_manager: DialogManager, **kwargs):
 
     return {
         "title": dialog_manager.dialog_data.get("task_title", "Без названия"),
-        "category": dialog_manager.dialog_data.get(
-            "category_name",
+        "category": categories_map.get(
+            dialog_manager.dialog_data.get("category_id"),
             "Без категории"
         ),
         "due_date": due_date_str,
@@ -58,15 +67,10 @@ async def on_category_selected(
     item_id: str
 ):
     """
-    Сохраняет выбранную категорию (ID и название)
-    и переключает на ввод названия.
+    Сохраняет ID выбранной категории и переключает на ввод названия.
+    Название берётся из кеша категорий при показе итогового экрана.
     """
     manager.dialog_data["category_id"] = int(item_id)
-    full_categories = manager.dialog_data.get("full_categories_list", [])
-    for category in full_categories:
-        if str(category["id"]) == item_id:
-            manager.dialog_data["category_name"] = category["name"]
-            break
     await manager.switch_to(AddTask.input_title)
 
 
@@ -91,13 +95,18 @@ async def on_description_entered(
 async def save_task(
         manager: DialogManager,
         event: Union[CallbackQuery, Message]):
-    """Централизованная функция для сохранения задачи."""
-    from ..tasks import send_task_notification
+    """
+    Централизованная функция для сохранения задачи.
 
+    Напоминание о сроке отдельно не планируется: его отправит
+    периодическая задача dispatch_due_reminders, когда наступит
+    REMINDER_HOUR в день срока.
+    """
+    api_client: DataClient = manager.middleware_data["api_client"]
     user_id = manager.event.from_user.id
     title = manager.dialog_data.get("task_title")
     due_date_str = manager.dialog_data.get("task_due_date")
-    success = await add_task(
+    success = await api_client.add_task(
         telegram_user_id=user_id,
         title=title,
         category_id=manager.dialog_data.get("category_id"),
@@ -105,13 +114,6 @@ async def save_task(
         due_date=due_date_str,
     )
     if success:
-        if due_date_str:
-            notification_time = datetime.fromisoformat(due_date_str).replace(
-                hour=19, minute=00
-            )
-            send_task_notification.apply_async(
-                args=[user_id, title], eta=notification_time
-            )
         await manager.switch_to(AddTask.success)
     else:
         error_message = "❌ Ошибка при добавлении задачи."
@@ -1,77 +1,153 @@
 from datetime import datetime
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional
 
 from aiogram import F
 from aiogram.types import CallbackQuery
 from aiogram_dialog import Dialog, DialogManager, Window
-from aiogram_dialog.widgets.kbd import (Button, Column, Row, Select, Start,
+from aiogram_dialog.widgets.kbd import (Button, Column, ManagedMultiselect,
+                                        Multiselect, Row, Select, Start,
                                         SwitchTo)
 from aiogram_dialog.widgets.text import Const, Format, Jinja, Multi
 
-from bot.api_client import (complete_task, delete_task, get_categories,
-                            get_task_by_id, get_tasks)
+from bot.api_client import DataClient
+from bot.cache import MainMenuPage, TaskPage
 from bot.dialogs.add_task import on_task_selected
 from bot.dialogs.states import AddTask, MainMenu
 
 
-async def incomplete_tasks_getter(dialog_manager: DialogManager, **kwargs):
+async def load_tasks_page(
+    dialog_manager: DialogManager,
+    listing: str,
+    fetch: Callable[..., Awaitable[Optional[TaskPage]]],
+) -> Optional[TaskPage]:
     """
-    Загружает список невыполненных задач для главного экрана.
+    Загружает текущую страницу списка задач через fetch(cursor)
+    и запоминает курсоры соседних страниц для кнопок пролистывания.
     """
-    user_id = dialog_manager.event.from_user.id
-    tasks = await get_tasks(user_id)
-    if not tasks:
-        return {"tasks_list": [], "has_tasks": False}
-    incomplete_tasks = [task for task in tasks if not task.get("completed")]
+    cursor_key = f"{listing}_cursor"
+    cursor = dialog_manager.dialog_data.get(cursor_key)
+    page = await fetch(cursor)
+    if page is not None and not page.tasks and cursor:
+        dialog_manager.dialog_data[cursor_key] = None
+        page = await fetch(None)
+    if page is None:
+        return None
+    dialog_manager.dialog_data[f"{listing}_next_cursor"] = page.next_cursor
+    dialog_manager.dialog_data[f"{listing}_previous_cursor"] = (
+        page.previous_cursor
+    )
+    return page
 
-    if not incomplete_tasks:
-        return {"tasks_list": [], "has_tasks": False}
 
-    dialog_manager.dialog_data["full_tasks_data"] = incomplete_tasks
-    all_categories = await get_categories(user_id)
-    categories_map = {
-        cat["id"]: cat.get("name", "N/A") for cat in all_categories
-        }
-    tasks_for_buttons = []
-    for task in incomplete_tasks:
-        category_ids = task.get("category", [])
-        category_names = [
-            categories_map.get(cat_id)
-            for cat_id in category_ids
+def category_names_str(
+    task: Dict, categories_map: Optional[Dict[int, str]] = None
+) -> str:
+    """
+    Названия категорий задачи через запятую: из category_names,
+    которые отдаёт главное меню, или по словарю categories_map.
+    """
+    names = task.get("category_names")
+    if names is None:
+        categories_map = categories_map or {}
+        names = [
+            categories_map[cat_id]
+            for cat_id in task.get("category", [])
             if cat_id in categories_map
         ]
-        categories_str = ", ".join(category_names) or "без категории"
-        tasks_for_buttons.append((task["title"], categories_str, task["id"]))
+    return ", ".join(names) or "без категории"
+
 
-    return {"tasks_list": tasks_for_buttons, "has_tasks": True}
+def pager_flags(page: Optional[TaskPage]) -> dict:
+    """Определяет, какие кнопки пролистывания показывать."""
+    return {
+        "has_next_page": page is not None and page.next_cursor is not None,
+        "has_previous_page": (
+            page is not None and page.previous_cursor is not None
+        ),
+    }
 
 
-async def completed_tasks_getter(dialog_manager: DialogManager, **kwargs):
+async def incomplete_tasks_getter(
+    dialog_manager: DialogManager, api_client: DataClient, **kwargs
+):
     """
-    Загружает список выполненных задач.
+    Загружает страницу невыполненных задач для главного экрана.
+
+    Задачи, названия категорий и счётчики приходят одним запросом
+    get_main_menu, а при повторном показе берутся из кеша.
     """
     user_id = dialog_manager.event.from_user.id
-    tasks = await get_tasks(user_id)
-    if not tasks:
-        return {"completed_tasks_list": [], "has_completed_tasks": False}
-    completed_tasks = [task for task in tasks if task.get("completed")]
+    page: Optional[MainMenuPage] = await load_tasks_page(
+        dialog_manager, "active", partial(api_client.get_main_menu, user_id)
+    )
+    incomplete_tasks = page.tasks if page is not None else []
+    counts = {
+        "active_count": page.counts.get("active", 0) if page else 0,
+        "completed_count": page.counts.get("completed", 0) if page else 0,
+    }
+
+    if not incomplete_tasks:
+        return {
+            "tasks_list": [],
+            "has_tasks": False,
+            **counts,
+            **pager_flags(page),
+        }
+
+    tasks_for_buttons = [
+        (
+            task["title"],
+            category_names_str(task, page.category_names),
+            task["id"],
+        )
+        for task in incomplete_tasks
+    ]
+    return {
+        "tasks_list": tasks_for_buttons,
+        "has_tasks": True,
+        **counts,
+        **pager_flags(page),
+    }
+
+
+async def completed_tasks_getter(
+    dialog_manager: DialogManager, api_client: DataClient, **kwargs
+):
+    """
+    Загружает страницу выполненных задач.
+    """
+    user_id = dialog_manager.event.from_user.id
+    page = await load_tasks_page(
+        dialog_manager,
+        "completed",
+        partial(api_client.get_tasks_page, user_id, True),
+    )
+    completed_tasks = page.tasks if page is not None else []
 
     if not completed_tasks:
-        return {"completed_tasks_list": [], "has_completed_tasks": False}
-    dialog_manager.dialog_data["full_completed_tasks_data"] = completed_tasks
+        return {
+            "completed_tasks_list": [],
+            "has_completed_tasks": False,
+            **pager_flags(page),
+        }
     tasks_for_buttons = [
         (task["title"], task["id"]) for task in completed_tasks
         ]
     return {
         "completed_tasks_list": tasks_for_buttons,
-        "has_completed_tasks": True
+        "has_completed_tasks": True,
+        **pager_flags(page),
     }
 
 
-async def task_details_getter(dialog_manager: DialogManager, **kwargs):
+async def task_details_getter(
+    dialog_manager: DialogManager, api_client: DataClient, **kwargs
+):
     """Загружает детали выбранной задачи."""
     task_id = dialog_manager.dialog_data.get("task_id")
     user_id = dialog_manager.event.from_user.id
-    task = await get_task_by_id(task_id=task_id, user_id=user_id)
+    task = await api_client.get_task_by_id(task_id=task_id, user_id=user_id)
     if task is None:
         return {
             "title": "Задача не найдена",
@@ -97,17 +173,12 @@ async def task_details_getter(dialog_manager: DialogManager, **kwargs):
             due_date_str = dt.strftime("%d.%m.%Y")
         except ValueError:
             due_date_str = due_date_val
-    all_categories = await get_categories(user_id)
-    categories_map = {
-        cat["id"]: cat.get("name", "N/A") for cat in all_categories
-    }
-    category_ids = task.get("category", [])
-    category_names = [
-        categories_map.get(cat_id)
-        for cat_id in category_ids
-        if cat_id in categories_map
-    ]
-    categories_str = ", ".join(category_names) or "без категории"
+    if "category_names" in task:
+        categories_str = category_names_str(task)
+    else:
+        categories_str = category_names_str(
+            task, await api_client.get_category_names(user_id)
+        )
     return {
         "title": task.get("title", "N/A"),
         "description": task.get("description", "N/A"),
@@ -118,15 +189,30 @@ async def task_details_getter(dialog_manager: DialogManager, **kwargs):
     }
 
 
+async def on_page_clicked(
+    callback: CallbackQuery, button: Button, manager: DialogManager
+):
+    """
+    Переключает страницу списка задач.
+
+    ID кнопки имеет вид '<список>_<направление>', например 'active_next'.
+    """
+    listing, direction = button.widget_id.rsplit("_", 1)
+    manager.dialog_data[f"{listing}_cursor"] = manager.dialog_data.get(
+        f"{listing}_{direction}_cursor"
+    )
+
+
 async def on_delete_clicked(
     callback: CallbackQuery, button: Button, manager: DialogManager
 ):
     """
     Обрабатывает нажатие на кнопку удаления задачи.
     """
+    api_client: DataClient = manager.middleware_data["api_client"]
     task_id = manager.dialog_data.get("task_id")
     user_id = manager.event.from_user.id
-    await delete_task(task_id=task_id, user_id=user_id)
+    await api_client.delete_task(task_id=task_id, user_id=user_id)
     await callback.answer("Задача успешно удалена!")
     await manager.switch_to(MainMenu.view_tasks)
 
@@ -137,18 +223,67 @@ async def on_done_clicked(
     """
     Обрабатывает нажатие на кнопку "Готово", отмечая задачу как выполненную.
     """
+    api_client: DataClient = manager.middleware_data["api_client"]
     user_id = manager.event.from_user.id
     task_id = manager.dialog_data.get("task_id")
-    await complete_task(user_id=user_id, task_id=task_id)
+    await api_client.complete_task(user_id=user_id, task_id=task_id)
     await callback.answer("Задача отмечена как выполненная!")
     await manager.switch_to(MainMenu.view_tasks)
 
 
+def checked_task_ids(manager: DialogManager) -> List[int]:
+    """Возвращает ID задач, отмеченных в режиме выбора."""
+    selector: ManagedMultiselect = manager.find("tasks_multiselect")
+    return [int(item_id) for item_id in selector.get_checked()]
+
+
+async def on_bulk_done_clicked(
+    callback: CallbackQuery, button: Button, manager: DialogManager
+):
+    """Отмечает выбранные задачи выполненными одним запросом."""
+    task_ids = checked_task_ids(manager)
+    if not task_ids:
+        await callback.answer("Сначала отметьте задачи.")
+        return
+    api_client: DataClient = manager.middleware_data["api_client"]
+    user_id = manager.event.from_user.id
+    updated = await api_client.bulk_complete_tasks(user_id, task_ids)
+    if updated is None:
+        await callback.answer("❌ Не удалось отметить задачи.")
+        return
+    await manager.find("tasks_multiselect").reset_checked()
+    await callback.answer(f"Выполнено задач: {updated}")
+    await manager.switch_to(MainMenu.view_tasks)
+
+
+async def on_bulk_delete_clicked(
+    callback: CallbackQuery, button: Button, manager: DialogManager
+):
+    """Удаляет выбранные задачи одним запросом."""
+    task_ids = checked_task_ids(manager)
+    if not task_ids:
+        await callback.answer("Сначала отметьте задачи.")
+        return
+    api_client: DataClient = manager.middleware_data["api_client"]
+    user_id = manager.event.from_user.id
+    deleted = await api_client.bulk_delete_tasks(user_id, task_ids)
+    if deleted is None:
+        await callback.answer("❌ Не удалось удалить задачи.")
+        return
+    await manager.find("tasks_multiselect").reset_checked()
+    await callback.answer(f"Удалено задач: {deleted}")
+    await manager.switch_to(MainMenu.view_tasks)
+
+
 main_menu_dialog = Dialog(
     Window(
         Format("Привет, {event.from_user.username}!\n"),
         Const("Ваш список активных задач:", when="has_tasks"),
         Const("У вас пока нет задач.", when=~F["has_tasks"]),
+        Format(
+            "Активных: {active_count}, выполненных: {completed_count}.",
+            when="has_tasks",
+        ),
         Column(
             Select(
                 Format("📝 {item[0]} ({item[1]})"),
@@ -158,6 +293,20 @@ main_menu_dialog = Dialog(
                 on_click=on_task_selected,
             )
         ),
+        Row(
+            Button(
+                Const("◀️"),
+                id="active_previous",
+                on_click=on_page_clicked,
+                when="has_previous_page",
+            ),
+            Button(
+                Const("▶️"),
+                id="active_next",
+                on_click=on_page_clicked,
+                when="has_next_page",
+            ),
+        ),
         Row(
             Start(
                 Const("➕ Добавить"),
@@ -170,9 +319,61 @@ main_menu_dialog = Dialog(
                 state=MainMenu.view_completed_tasks,
             ),
         ),
+        SwitchTo(
+            Const("☑️ Выбрать несколько"),
+            id="select_tasks",
+            state=MainMenu.select_tasks,
+            when="has_tasks",
+        ),
         state=MainMenu.view_tasks,
         getter=incomplete_tasks_getter,
     ),
+    Window(
+        Const("Отметьте задачи и выберите действие:", when="has_tasks"),
+        Const("У вас пока нет задач.", when=~F["has_tasks"]),
+        Column(
+            Multiselect(
+                Format("☑️ {item[0]}"),
+                Format("⬜ {item[0]}"),
+                id="tasks_multiselect",
+                item_id_getter=lambda item: item[2],
+                items="tasks_list",
+            )
+        ),
+        Row(
+            Button(
+                Const("◀️"),
+                id="active_previous",
+                on_click=on_page_clicked,
+                when="has_previous_page",
+            ),
+            Button(
+                Const("▶️"),
+                id="active_next",
+                on_click=on_page_clicked,
+                when="has_next_page",
+            ),
+        ),
+        Row(
+            Button(
+                Const("✅ Выполнить"),
+                id="bulk_done",
+                on_click=on_bulk_done_clicked,
+            ),
+            Button(
+                Const("🗑️ Удалить"),
+                id="bulk_delete",
+                on_click=on_bulk_delete_clicked,
+            ),
+        ),
+        SwitchTo(
+            Const("⬅️ Отмена"),
+            id="cancel_select",
+            state=MainMenu.view_tasks,
+        ),
+        state=MainMenu.select_tasks,
+        getter=incomplete_tasks_getter,
+    ),
     Window(
         Const("Список выполненных задач:", when="has_completed_tasks"),
         Const("У вас нет выполненных задач.", when=~F["has_completed_tasks"]),
@@ -185,6 +386,20 @@ main_menu_dialog = Dialog(
                 on_click=on_task_selected,
             )
         ),
+        Row(
+            Button(
+                Const("◀️"),
+                id="completed_previous",
+                on_click=on_page_clicked,
+                when="has_previous_page",
+            ),
+            Button(
+                Const("▶️"),
+                id="completed_next",
+                on_click=on_page_clicked,
+                when="has_next_page",
+            ),
+        ),
         SwitchTo(
             Const("⬅️ К активным задачам"),
             id="back_to_active",
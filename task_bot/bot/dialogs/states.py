@@ -5,6 +5,7 @@ class MainMenu(StatesGroup):
     view_tasks = State()
     details = State()
     view_completed_tasks = State()
+    select_tasks = State()
 
 
 class AddTask(StatesGroup):
@@ -0,0 +1,124 @@
+import copy
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+DEFAULT_POOL_OPTIONS = {"min_size": 2, "max_size": 10}
+
+
+class Command(BaseCommand):
+    """
+    Замеряет накладные расходы на соединение с Postgres в расчёте на
+    один запрос к API.
+
+    Каждый «запрос» повторяет жизненный цикл соединения в Django:
+    close_old_connections на request_started, крошечный SQL-запрос и
+    close_old_connections на request_finished. Сравниваются три
+    режима соединений с базой из настроек: новое соединение на каждый
+    запрос (CONN_MAX_AGE=0 без пула), постоянное соединение
+    (CONN_MAX_AGE) и пул psycopg. Для каждого режима выводятся
+    задержки и число физических соединений, которые понадобились.
+    """
+
+    help = (
+        "Benchmarks per-request Postgres connection overhead without "
+        "persistence, with CONN_MAX_AGE and with the psycopg pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=500,
+            help="Simulated requests per mode.",
+        )
+        parser.add_argument(
+            "--conn-max-age", type=int, default=60,
+            help="CONN_MAX_AGE for the persistent connection mode.",
+        )
+
+    def handle(self, *args, **options):
+        base = connections["default"].settings_dict
+        if base["ENGINE"] != "django.db.backends.postgresql":
+            raise CommandError(
+                "Замер имеет смысл только для Postgres: "
+                "задайте DATABASE_CHOICE=postgres."
+            )
+        pool_options = base["OPTIONS"].get("pool") or DEFAULT_POOL_OPTIONS
+        if pool_options is True:
+            pool_options = DEFAULT_POOL_OPTIONS
+        modes = (
+            ("новое соединение", {"CONN_MAX_AGE": 0}, None),
+            (
+                f"CONN_MAX_AGE={options['conn_max_age']}",
+                {"CONN_MAX_AGE": options["conn_max_age"]},
+                None,
+            ),
+            ("пул psycopg", {"CONN_MAX_AGE": 0}, pool_options),
+        )
+        baseline = None
+        for index, (label, overrides, pool) in enumerate(modes):
+            wrapper = self.make_connection(
+                base, f"bench_connections_{index}", overrides, pool
+            )
+            try:
+                samples, backends = self.measure(
+                    wrapper, options["requests"]
+                )
+            finally:
+                wrapper.close()
+                if pool:
+                    wrapper.close_pool()
+            mean = statistics.fmean(samples)
+            samples.sort()
+            line = (
+                f"{label}: среднее {mean:.3f} мс, "
+                f"p50 {statistics.median(samples):.3f} мс, "
+                f"p99 {samples[int(len(samples) * 0.99) - 1]:.3f} мс, "
+                f"соединений: {backends}"
+            )
+            if baseline is None:
+                baseline = mean
+            else:
+                line += f", экономия {baseline - mean:.3f} мс на запрос"
+            self.stdout.write(line)
+
+    def make_connection(self, base, alias, overrides, pool):
+        """
+        Отдельное подключение с настройками default и overrides; у
+        каждого alias свой пул.
+        """
+        settings_dict = copy.deepcopy(base)
+        settings_dict.update(overrides)
+        settings_dict["CONN_HEALTH_CHECKS"] = True
+        settings_dict["OPTIONS"].pop("pool", None)
+        if pool:
+            settings_dict["OPTIONS"]["pool"] = dict(pool)
+        backend = load_backend(settings_dict["ENGINE"])
+        return backend.DatabaseWrapper(settings_dict, alias)
+
+    def measure(self, wrapper, requests):
+        """
+        Задержки запросов в миллисекундах и число разных серверных
+        процессов Postgres, то есть физических соединений.
+        """
+        samples = []
+        backend_pids = set()
+        # Прогрев: открытие пула и первое соединение не в счёт.
+        for _ in range(5):
+            self.request(wrapper)
+        for _ in range(requests):
+            started = time.perf_counter()
+            backend_pids.add(self.request(wrapper))
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples, len(backend_pids)
+
+    def request(self, wrapper):
+        """Один запрос к API глазами соединения с базой."""
+        wrapper.close_if_unusable_or_obsolete()
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT pg_backend_pid()")
+            pid = cursor.fetchone()[0]
+        wrapper.close_if_unusable_or_obsolete()
+        return pid
@@ -0,0 +1,78 @@
+import json
+import timeit
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer, orjson
+from bot import json_codec
+from bot.management.commands.measure_dialog_state import sample_task
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает кодирование и разбор страниц списка задач разного
+    размера: JSONRenderer DRF и json.loads из response.json() aiohttp
+    против FastJSONRenderer и bot.json_codec.loads.
+
+    Для каждого размера выводится время одной операции в микросекундах
+    и ускорение.
+    """
+
+    help = (
+        "Micro-benchmarks encoding and decoding task lists with the "
+        "stdlib and the fast JSON codec"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="10,100,1000,2000",
+            help="Comma-separated numbers of tasks per payload.",
+        )
+        parser.add_argument(
+            "--seconds", type=float, default=0.5,
+            help="Approximate time per measurement.",
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write(
+                "orjson не установлен: быстрый кодек работает как stdlib."
+            )
+        stdlib_renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+        for size in map(int, options["sizes"].split(",")):
+            data = {
+                "next": "http://backend:8000/api/tasks/?cursor=cD0yMDI2",
+                "previous": None,
+                "results": [sample_task(i) for i in range(1, size + 1)],
+            }
+            body = stdlib_renderer.render(data)
+            assert fast_renderer.render(data) == body
+            for operation, stdlib, fast in (
+                (
+                    "кодирование",
+                    lambda: stdlib_renderer.render(data),
+                    lambda: fast_renderer.render(data),
+                ),
+                (
+                    "разбор",
+                    lambda: json.loads(body.decode()),
+                    lambda: json_codec.loads(body),
+                ),
+            ):
+                stdlib_us = self.measure(stdlib, options["seconds"])
+                fast_us = self.measure(fast, options["seconds"])
+                self.stdout.write(
+                    f"{size} задач ({len(body) / 1024:.1f} КБ), "
+                    f"{operation}: stdlib {stdlib_us:.1f} мкс, "
+                    f"быстрый {fast_us:.1f} мкс "
+                    f"(x{stdlib_us / fast_us:.1f})"
+                )
+
+    def measure(self, func, seconds):
+        """Среднее время вызова func в микросекундах."""
+        timer = timeit.Timer(func)
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * seconds / elapsed))
+        return min(timer.repeat(repeat=3, number=number)) / number * 1e6
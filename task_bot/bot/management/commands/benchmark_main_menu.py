@@ -0,0 +1,140 @@
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+
+from bot.api_client import ApiClient
+from bot.config import config
+from bot.dialogs.main_menu import incomplete_tasks_getter
+from bot.management.commands.benchmark_task_queries import (
+    BENCH_TELEGRAM_ID_BASE, BENCH_USERNAME_PREFIX)
+from bot.models import Category, Task, User
+from bot.orm_client import OrmClient
+
+
+class QuietHandler(WSGIRequestHandler):
+    """
+    Обработчик без журнала запросов и с TCP_NODELAY: иначе заголовки
+    и тело ответа уходят разными пакетами, и задержанное подтверждение
+    добавляет к каждому запросу десятки миллисекунд.
+    """
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает задержку геттера главного меню с клиентом данных по HTTP
+    (ApiClient) и через асинхронный ORM (OrmClient).
+
+    Перед каждым вызовом кеши клиента сбрасываются, поэтому каждый
+    вызов доходит до backend или базы. Без --api-url backend для
+    ApiClient поднимается в этом же процессе.
+    """
+
+    help = (
+        "Measures p50 and p99 latency of the main menu getter with the "
+        "HTTP and the ORM data clients"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks", type=int, default=200,
+            help="Number of tasks the benchmark user should have.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=300,
+            help="Getter calls per backend.",
+        )
+        parser.add_argument(
+            "--api-url", default="",
+            help="Running backend API URL, e.g. http://backend:8000/api/.",
+        )
+
+    def handle(self, *args, **options):
+        user = self.prepare_user(options["tasks"])
+        server = None
+        api_url = options["api_url"]
+        if not api_url:
+            server = ThreadedWSGIServer(
+                ("127.0.0.1", 0), QuietHandler, allow_reuse_address=False
+            )
+            server.set_app(get_wsgi_application())
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            api_url = f"http://127.0.0.1:{server.server_port}/api/"
+        cache_options = ApiClient.cache_options(config)
+        clients = (
+            ("http", ApiClient(base_url=api_url, **cache_options)),
+            ("orm", OrmClient(**cache_options)),
+        )
+        try:
+            for name, client in clients:
+                samples = asyncio.run(
+                    self.measure(client, user.telegram_id, options["requests"])
+                )
+                samples.sort()
+                self.stdout.write(
+                    f"{name}: p50={statistics.median(samples):.2f} мс, "
+                    f"p99={samples[int(len(samples) * 0.99) - 1]:.2f} мс"
+                )
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+    async def measure(self, client, telegram_id, requests):
+        manager = SimpleNamespace(
+            dialog_data={},
+            event=SimpleNamespace(from_user=SimpleNamespace(id=telegram_id)),
+        )
+        await client.start()
+        samples = []
+        try:
+            for _ in range(requests + 1):
+                client.invalidate_categories()
+                client.invalidate_tasks()
+                started = time.perf_counter()
+                data = await incomplete_tasks_getter(manager, client)
+                samples.append((time.perf_counter() - started) * 1000)
+                assert data["has_tasks"], "Геттер не вернул задачи"
+        finally:
+            await client.close()
+        # Первый вызов открывает соединения, его не учитываем.
+        return samples[1:]
+
+    def prepare_user(self, tasks_count):
+        """Создаёт тестового пользователя с нужным числом задач."""
+        user, _ = User.objects.get_or_create(
+            telegram_id=BENCH_TELEGRAM_ID_BASE - 2,
+            defaults={"username": f"{BENCH_USERNAME_PREFIX}main-menu"},
+        )
+        category, _ = Category.objects.get_or_create(
+            slug="bench", defaults={"name": "Бенчмарк"}
+        )
+        missing = tasks_count - user.tasks.filter(completed=False).count()
+        if missing > 0:
+            tasks = Task.objects.bulk_create(
+                Task(
+                    title=f"Задача {i}",
+                    description="Описание задачи " * 5,
+                    user=user,
+                )
+                for i in range(missing)
+            )
+            through = Task.category.through
+            through.objects.bulk_create(
+                through(task_id=task.id, category_id=category.id)
+                for task in tasks
+            )
+        return user
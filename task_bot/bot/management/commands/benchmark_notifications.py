@@ -0,0 +1,208 @@
+import asyncio
+import itertools
+import threading
+import time
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import TelegramAPIError
+from aiohttp import web
+from django.core.management.base import BaseCommand
+
+from bot.notifications import NotificationSender
+
+BENCH_TOKEN = "123456:bench"
+
+
+class TelegramStub:
+    """
+    Заглушка Telegram Bot API: отвечает на sendMessage после задержки.
+    Каждый throttle_every-й запрос, как и настоящий Telegram, начинает
+    ожидание (flood wait): ответ 429 с retry_after=1 и отказ всем
+    запросам до конца этой секунды.
+    """
+
+    def __init__(self, latency: float, throttle_every: int):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.requests = 0
+        self.throttled = 0
+        self.blocked_until = 0.0
+        self.message_ids = itertools.count(1)
+        self.loop = asyncio.new_event_loop()
+        self.runner = None
+        self.port = None
+        self.started = threading.Event()
+
+    async def send_message(self, request):
+        self.requests += 1
+        data = await request.post()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        if self.throttle_every and self.requests % self.throttle_every == 0:
+            self.blocked_until = max(self.blocked_until, now + 1)
+        if now < self.blocked_until:
+            self.throttled += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                }
+            )
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": next(self.message_ids),
+                    "date": int(time.time()),
+                    "chat": {"id": int(data["chat_id"]), "type": "private"},
+                    "text": data["text"],
+                },
+            }
+        )
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_post(
+            f"/bot{BENCH_TOKEN}/sendMessage", self.send_message
+        )
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._start())
+        self.started.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.runner.cleanup())
+        self.loop.close()
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.started.wait()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+
+class Command(BaseCommand):
+    """
+    Замеряет скорость отправки уведомлений на заглушке Telegram Bot API.
+
+    Сравнивает прежний способ (asyncio.run и новый Bot на каждое
+    сообщение) с NotificationSender и выводит число сообщений в секунду.
+    """
+
+    help = (
+        "Measures sustained messages per second of NotificationSender "
+        "against a local Telegram Bot API stub"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--messages", type=int, default=300,
+            help="Messages per run.",
+        )
+        parser.add_argument(
+            "--chats", type=int, default=100,
+            help="Number of distinct chats to spread messages across.",
+        )
+        parser.add_argument(
+            "--latency", type=float, default=50,
+            help="Stub response latency in milliseconds.",
+        )
+        parser.add_argument(
+            "--throttle-every", type=int, default=0,
+            help="Start a 1 s flood wait on every N-th request.",
+        )
+        parser.add_argument(
+            "--global-rate", type=float, default=30,
+            help="Global messages per second allowed by the sender.",
+        )
+        parser.add_argument(
+            "--per-chat-rate", type=float, default=1,
+            help="Messages per second allowed per chat.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=20,
+            help="Concurrent requests of the sender.",
+        )
+        parser.add_argument(
+            "--skip-baseline", action="store_true",
+            help="Do not measure the one-Bot-per-message baseline.",
+        )
+
+    def handle(self, *args, **options):
+        messages = [
+            (1_000_000 + i % options["chats"], f"Напоминание {i}")
+            for i in range(options["messages"])
+        ]
+        with TelegramStub(
+            options["latency"] / 1000, options["throttle_every"]
+        ) as stub:
+            if not options["skip_baseline"]:
+                started = time.perf_counter()
+                failed = 0
+                for chat_id, text in messages:
+                    try:
+                        asyncio.run(
+                            self.send_with_new_bot(stub, chat_id, text)
+                        )
+                    except TelegramAPIError:
+                        failed += 1
+                self.report(
+                    "Bot на каждое сообщение", len(messages),
+                    time.perf_counter() - started,
+                )
+                self.stdout.write(f"Не доставлено без повторов: {failed}")
+
+            sender = NotificationSender(
+                token=BENCH_TOKEN,
+                api_server=stub.base_url,
+                global_rate=options["global_rate"],
+                per_chat_rate=options["per_chat_rate"],
+                concurrency=options["concurrency"],
+            )
+            try:
+                # Первая пачка прогревает соединения, как в живом воркере.
+                sender.send_batch(messages[: options["chats"]])
+                time.sleep(1)
+                started = time.perf_counter()
+                sender.send_batch(messages)
+                self.report(
+                    "NotificationSender", len(messages),
+                    time.perf_counter() - started,
+                )
+            finally:
+                sender.close()
+            self.stdout.write(
+                f"Статистика отправителя: {sender.stats()}, "
+                f"ответов 429 от заглушки: {stub.throttled}"
+            )
+
+    async def send_with_new_bot(self, stub, chat_id, text):
+        session = AiohttpSession(
+            api=TelegramAPIServer.from_base(stub.base_url)
+        )
+        async with Bot(token=BENCH_TOKEN, session=session) as bot:
+            await bot.send_message(chat_id=chat_id, text=text)
+
+    def report(self, name, count, elapsed):
+        self.stdout.write(
+            f"{name}: {count} сообщений за {elapsed:.2f} с, "
+            f"{count / elapsed:.1f} сообщений/с"
+        )
@@ -0,0 +1,100 @@
+import asyncio
+import statistics
+import threading
+import time
+
+import aiohttp
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.core.wsgi import get_wsgi_application
+
+from bot.management.commands.benchmark_main_menu import QuietHandler
+from bot.management.commands.benchmark_task_serialization import \
+    Command as SerializationBenchmark
+
+LIST_FIELDS = "id,title,category"
+ENCODINGS = ("identity", "gzip", "br")
+
+
+class Command(BaseCommand):
+    """
+    Замеряет объём и время загрузки всех задач пользователя через API:
+    с полным набором полей и с fields=id,title,category, без сжатия,
+    с gzip и с brotli.
+
+    Клиент — aiohttp, как у бота, backend поднимается в этом же
+    процессе. Объём — сумма Content-Length по всем страницам, то есть
+    байты, которые прошли бы по сети. Время включает распаковку.
+    """
+
+    help = (
+        "Measures task list payload size and latency with and without "
+        "sparse fieldsets and response compression"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks", type=int, default=2000,
+            help="Number of tasks the benchmark user should have.",
+        )
+        parser.add_argument(
+            "--page-size", type=int, default=100,
+            help="page_size passed to the list endpoint.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20,
+            help="Full list downloads per variant.",
+        )
+
+    def handle(self, *args, **options):
+        user = SerializationBenchmark().prepare_user(options["tasks"])
+        server = ThreadedWSGIServer(
+            ("127.0.0.1", 0), QuietHandler, allow_reuse_address=False
+        )
+        server.set_app(get_wsgi_application())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/api/tasks/"
+        try:
+            for fields in ("", LIST_FIELDS):
+                for encoding in ENCODINGS:
+                    size, samples = asyncio.run(
+                        self.measure(
+                            url, user.telegram_id, fields, encoding, options
+                        )
+                    )
+                    samples.sort()
+                    self.stdout.write(
+                        f"fields={fields or 'все'}, {encoding}: "
+                        f"{size / 1024:.1f} КБ, "
+                        f"p50={statistics.median(samples):.1f} мс, "
+                        f"max={samples[-1]:.1f} мс"
+                    )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    async def measure(self, url, telegram_id, fields, encoding, options):
+        params = {
+            "owner_tg_id": telegram_id,
+            "page_size": options["page_size"],
+        }
+        if fields:
+            params["fields"] = fields
+        headers = {aiohttp.hdrs.ACCEPT_ENCODING: encoding}
+        samples = []
+        async with aiohttp.ClientSession(headers=headers) as session:
+            for _ in range(options["repeat"] + 1):
+                size = 0
+                page_url, page_params = url, params
+                started = time.perf_counter()
+                while page_url:
+                    async with session.get(
+                        page_url, params=page_params
+                    ) as response:
+                        response.raise_for_status()
+                        data = await response.json()
+                        size += int(response.headers["Content-Length"])
+                    page_url, page_params = data["next"], None
+                samples.append((time.perf_counter() - started) * 1000)
+        # Первая загрузка открывает соединение, её не учитываем.
+        return size, samples[1:]
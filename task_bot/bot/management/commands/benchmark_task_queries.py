@@ -0,0 +1,257 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.pagination import TaskCursorPagination
+from api.views import TaskViewSet
+from bot.models import Category, Task, User
+
+BENCH_USERNAME_PREFIX = "bench-"
+BENCH_TELEGRAM_ID_BASE = 9_000_000_000
+BENCH_INDEXES = ("task_user_completed_idx", "task_reminder_pending_idx")
+# Задачи создаются в течение двух лет до момента наполнения.
+BENCH_HISTORY_MINUTES = 60 * 24 * 365 * 2
+
+
+class Command(BaseCommand):
+    """
+    Замеряет запросы TaskViewSet на большой базе задач.
+
+    Наполняет базу тестовыми пользователями и задачами, выполняет те же
+    запросы, что и API, и выводит задержки и планы запросов. С ключом
+    --compare дополнительно снимает индексы из миграции 0005 внутри
+    транзакции, повторяет замеры и откатывает изменения.
+    """
+
+    help = (
+        "Benchmarks TaskViewSet queries on a seeded database and prints "
+        "latencies and query plans with and without the access indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Number of tasks to create before measuring.",
+        )
+        parser.add_argument(
+            "--users", type=int, default=1000,
+            help="Number of benchmark users to spread tasks across.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=50,
+            help="Executions per query.",
+        )
+        parser.add_argument(
+            "--compare", action="store_true",
+            help="Also measure with the access indexes dropped.",
+        )
+        parser.add_argument(
+            "--clear", action="store_true",
+            help="Delete benchmark users and their tasks and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted, _ = User.objects.filter(
+                username__startswith=BENCH_USERNAME_PREFIX
+            ).delete()
+            self.stdout.write(
+                self.style.SUCCESS(f"Удалено объектов: {deleted}")
+            )
+            return
+        if options["seed"]:
+            self.seed(options["seed"], options["users"])
+
+        user = (
+            User.objects.filter(username__startswith=BENCH_USERNAME_PREFIX)
+            .order_by("id")
+            .first()
+        )
+        if user is None:
+            self.stdout.write(
+                self.style.ERROR(
+                    "Нет тестовых данных, запустите команду с --seed."
+                )
+            )
+            return
+
+        after = self.run_suite(user, options["repeat"])
+        self.report("С индексами", after)
+        if options["compare"]:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for name in BENCH_INDEXES:
+                        cursor.execute(
+                            f"DROP INDEX {connection.ops.quote_name(name)}"
+                        )
+                before = self.run_suite(user, options["repeat"])
+                transaction.set_rollback(True)
+            self.report("Без индексов", before)
+            self.compare(before, after)
+
+    def seed(self, total, users_count):
+        """Создаёт пользователей и задачи пачками."""
+        self.stdout.write(
+            f"Создание {total} задач для {users_count} пользователей..."
+        )
+        category, _ = Category.objects.get_or_create(
+            slug="bench", defaults={"name": "Бенчмарк"}
+        )
+        start = User.objects.filter(
+            username__startswith=BENCH_USERNAME_PREFIX
+        ).count()
+        users = User.objects.bulk_create(
+            User(
+                username=f"{BENCH_USERNAME_PREFIX}{i}",
+                telegram_id=BENCH_TELEGRAM_ID_BASE + i,
+            )
+            for i in range(start, start + users_count)
+        )
+        now = timezone.now()
+        rng = random.Random(42)
+        batch_size = 5000
+        through = Task.category.through
+        # created_at проставляется auto_now_add, поэтому после вставки
+        # задачи «состариваются» UPDATE: по одной дате создания на
+        # группу из group_size задач.
+        group_size = 50
+        for offset in range(0, total, batch_size):
+            batch = []
+            created = []
+            for _ in range(min(batch_size, total - offset)):
+                if len(batch) % group_size == 0:
+                    created_at = now - timedelta(
+                        minutes=rng.randint(0, BENCH_HISTORY_MINUTES)
+                    )
+                    created.append(created_at)
+                due_date = None
+                if rng.random() < 0.5:
+                    due_date = created_at + timedelta(
+                        days=rng.randint(0, 60)
+                    )
+                batch.append(
+                    Task(
+                        title=f"Задача {offset + len(batch)}",
+                        due_date=due_date,
+                        completed=rng.random() < 0.7,
+                        user=rng.choice(users),
+                    )
+                )
+            with transaction.atomic():
+                tasks = Task.objects.bulk_create(batch)
+                through.objects.bulk_create(
+                    through(task_id=task.id, category_id=category.id)
+                    for task in tasks
+                )
+                for group, created_at in enumerate(created):
+                    group_tasks = tasks[
+                        group * group_size:(group + 1) * group_size
+                    ]
+                    Task.objects.filter(
+                        id__in=[task.id for task in group_tasks]
+                    ).update(created_at=created_at)
+            self.stdout.write(f"  {offset + len(batch)}/{total}")
+        # Напоминания о давно прошедших сроках уже отправлены
+        # планировщиком.
+        Task.objects.filter(
+            user__in=users, due_date__lt=now - timedelta(days=2)
+        ).update(reminder_sent_at=F("due_date"))
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    def viewset_queryset(self, params, action="list"):
+        """Строит queryset так же, как это делает TaskViewSet."""
+        request = Request(APIRequestFactory().get("/api/tasks/", params))
+        view = TaskViewSet(
+            action=action, request=request, format_kwarg=None, kwargs={}
+        )
+        return view.get_queryset()
+
+    def build_queries(self, user):
+        """Возвращает запросы, которые выполняет API для пользователя."""
+        ordering = TaskCursorPagination.ordering
+        page = TaskCursorPagination.page_size + 1
+        base = {"owner_tg_id": user.telegram_id}
+        today = timezone.localdate()
+        task = Task.objects.filter(user=user).only("id").first()
+        queries = {
+            "list": base,
+            "list completed=false": {**base, "completed": "false"},
+            "list completed=true": {**base, "completed": "true"},
+            "list due_date range": {
+                **base,
+                "completed": "false",
+                "due_date_after": today.isoformat(),
+                "due_date_before": (today + timedelta(days=7)).isoformat(),
+            },
+        }
+        built = {
+            name: self.viewset_queryset(params).order_by(*ordering)[:page]
+            for name, params in queries.items()
+        }
+        if task is not None:
+            built["retrieve"] = self.viewset_queryset(
+                base, action="retrieve"
+            ).filter(pk=task.id)
+        remind_before = timezone.now() - timedelta(
+            hours=settings.REMINDER_HOUR
+        )
+        built["due reminders (all users)"] = Task.objects.filter(
+            completed=False,
+            due_date__isnull=False,
+            reminder_sent_at__isnull=True,
+            due_date__gt=remind_before - timedelta(
+                hours=settings.REMINDER_LOOKBACK_HOURS
+            ),
+            due_date__lte=remind_before,
+        ).order_by("due_date").only("id")[:settings.REMINDER_BATCH_SIZE]
+        return built
+
+    def run_suite(self, user, repeat):
+        results = {}
+        for name, queryset in self.build_queries(user).items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {
+                "p50": statistics.median(timings),
+                "p95": statistics.quantiles(timings, n=20)[-1]
+                if len(timings) > 1 else timings[0],
+                "plan": self.explain(queryset),
+            }
+        return results
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def report(self, title, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name}: p50={result['p50']:.2f} мс, "
+                f"p95={result['p95']:.2f} мс"
+            )
+            for line in result["plan"].splitlines():
+                self.stdout.write(f"    {line}")
+
+    def compare(self, before, after):
+        self.stdout.write(self.style.MIGRATE_HEADING("Сравнение p50"))
+        for name in after:
+            speedup = before[name]["p50"] / max(after[name]["p50"], 1e-6)
+            self.stdout.write(
+                f"{name}: {before[name]['p50']:.2f} мс -> "
+                f"{after[name]['p50']:.2f} мс (x{speedup:.1f})"
+            )
@@ -0,0 +1,102 @@
+import time
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from api.views import TaskViewSet
+from bot.management.commands.benchmark_task_queries import (
+    BENCH_TELEGRAM_ID_BASE, BENCH_USERNAME_PREFIX)
+from bot.models import Category, Task, User
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает быстрый список задач с путём через TaskSerializer.
+
+    Вызывает асинхронное представление списка напрямую, без HTTP,
+    через async_to_sync и для каждого варианта выводит число запросов
+    в секунду и процессорное время на запрос.
+    """
+
+    help = (
+        "Compares requests per second and CPU time per request of the "
+        "fast task list path and the TaskSerializer path"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks", type=int, default=2000,
+            help="Number of tasks the benchmark user should have.",
+        )
+        parser.add_argument(
+            "--page-size", type=int, default=100,
+            help="page_size passed to the list endpoint.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200,
+            help="Requests per path.",
+        )
+
+    def handle(self, *args, **options):
+        user = self.prepare_user(options["tasks"])
+        view = async_to_sync(TaskViewSet.as_view({"get": "list"}))
+        factory = APIRequestFactory()
+        params = {
+            "owner_tg_id": user.telegram_id,
+            "page_size": options["page_size"],
+        }
+
+        def call():
+            response = view(factory.get("/api/tasks/", params))
+            response.render()
+            return response
+
+        results = {}
+        for name, fast in (("TaskSerializer", False), ("fast path", True)):
+            with patch.object(TaskViewSet, "fast_list", fast):
+                call()
+                wall_started = time.perf_counter()
+                cpu_started = time.process_time()
+                for _ in range(options["requests"]):
+                    call()
+                wall = time.perf_counter() - wall_started
+                cpu = time.process_time() - cpu_started
+            results[name] = (options["requests"] / wall, cpu)
+            self.stdout.write(
+                f"{name}: {results[name][0]:.1f} запросов/с, "
+                f"{cpu / options['requests'] * 1000:.2f} мс CPU на запрос"
+            )
+        slow_rps = results["TaskSerializer"][0]
+        fast_rps = results["fast path"][0]
+        self.stdout.write(
+            self.style.SUCCESS(f"Ускорение: x{fast_rps / slow_rps:.2f}")
+        )
+
+    def prepare_user(self, tasks_count):
+        """Создаёт тестового пользователя с нужным числом задач."""
+        telegram_id = BENCH_TELEGRAM_ID_BASE - 1
+        user, _ = User.objects.get_or_create(
+            telegram_id=telegram_id,
+            defaults={"username": f"{BENCH_USERNAME_PREFIX}serialization"},
+        )
+        category, _ = Category.objects.get_or_create(
+            slug="bench", defaults={"name": "Бенчмарк"}
+        )
+        missing = tasks_count - user.tasks.count()
+        if missing > 0:
+            tasks = Task.objects.bulk_create(
+                Task(
+                    title=f"Задача {i}",
+                    description="Описание задачи " * 5,
+                    user=user,
+                )
+                for i in range(missing)
+            )
+            through = Task.category.through
+            through.objects.bulk_create(
+                through(task_id=task.id, category_id=category.id)
+                for task in tasks
+            )
+        return user
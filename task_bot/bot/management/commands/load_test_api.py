@@ -0,0 +1,104 @@
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from django.core.management.base import BaseCommand
+
+from bot.management.commands.benchmark_main_menu import \
+    Command as MainMenuBenchmark
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест backend API: concurrency клиентов с keep-alive
+    по очереди запрашивают страницу списка задач и главное меню бота
+    тестового пользователя.
+
+    Выводит число запросов в секунду, p50, p99 и число ошибок, чтобы
+    сравнить runserver и gunicorn с воркерами uvicorn на одной базе.
+    """
+
+    help = (
+        "Load-tests the task API at --base-url and prints requests per "
+        "second and p50/p99 latency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url", default="http://127.0.0.1:8000/api/",
+            help="Backend API URL.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=32,
+            help="Concurrent clients.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=15,
+            help="Test duration in seconds.",
+        )
+        parser.add_argument(
+            "--tasks", type=int, default=200,
+            help="Number of tasks the benchmark user should have.",
+        )
+
+    def handle(self, *args, **options):
+        user = MainMenuBenchmark().prepare_user(options["tasks"])
+        samples, errors, elapsed = asyncio.run(
+            self.run(options, user.telegram_id)
+        )
+        samples.sort()
+        self.stdout.write(
+            f"{options['base_url']}: "
+            f"{len(samples) / elapsed:.1f} запросов/с, "
+            f"p50={statistics.median(samples):.1f} мс, "
+            f"p99={samples[int(len(samples) * 0.99) - 1]:.1f} мс, "
+            f"ошибок: {errors}"
+        )
+
+    async def run(self, options, telegram_id):
+        base_url = options["base_url"]
+        urls = (
+            f"{base_url}tasks/?owner_tg_id={telegram_id}&completed=false",
+            f"{base_url}tasks/main_menu/?owner_tg_id={telegram_id}",
+        )
+        samples = []
+        errors = 0
+        connector = aiohttp.TCPConnector(limit=options["concurrency"])
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async def warm_up(url):
+                async with session.get(url) as response:
+                    await response.read()
+
+            # Прогрев: соединения и первые запросы в каждом воркере.
+            await asyncio.gather(
+                *(warm_up(url) for url in urls * options["concurrency"])
+            )
+            deadline = time.perf_counter() + options["duration"]
+
+            async def client(offset):
+                nonlocal errors
+                index = offset
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        async with session.get(
+                            urls[index % len(urls)]
+                        ) as response:
+                            await response.read()
+                            if response.status != 200:
+                                errors += 1
+                                continue
+                    except aiohttp.ClientError:
+                        errors += 1
+                        continue
+                    finally:
+                        index += 1
+                    samples.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(client(i) for i in range(options["concurrency"]))
+            )
+            elapsed = time.perf_counter() - started
+        return samples, errors, elapsed
@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+from aiogram import Bot
+from aiogram.fsm.storage.memory import DisabledEventIsolation, MemoryStorage
+from aiogram_dialog.api.entities import Context
+from aiogram_dialog.context.storage import StorageProxy
+from django.core.management.base import BaseCommand
+
+from bot.config import config
+from bot.dialogs.states import AddTask, MainMenu
+from bot.storage import compact_json_dumps
+
+USER_ID = 1001
+
+
+def sample_task(task_id, completed=False):
+    """Задача в том виде, в каком её возвращает API."""
+    return {
+        "id": task_id,
+        "title": f"Подготовить отчёт по проекту номер {task_id}",
+        "description": "Собрать данные, проверить цифры и отправить "
+                       "руководителю до конца рабочего дня.",
+        "category": [1, 2],
+        "created_at": "2026-10-18T09:30:00.123456+03:00",
+        "due_date": "2026-10-20T00:00:00+03:00",
+        "completed": completed,
+        "user": str(USER_ID),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает размер состояния aiogram-dialog одного пользователя
+    до и после переноса списков задач и категорий из dialog_data в кеш.
+
+    Контексты главного меню и добавления задачи сохраняются через
+    StorageProxy, как это делает aiogram-dialog, и для каждого
+    выводится размер в байтах при стандартной и компактной
+    JSON-сериализации.
+    """
+
+    help = (
+        "Prints per-user aiogram-dialog state size with full task payloads "
+        "in dialog_data and with ids and cursors only"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size", type=int, default=config.api.page_size,
+            help="Tasks per page shown by the main menu.",
+        )
+        parser.add_argument(
+            "--categories", type=int, default=10,
+            help="Number of user categories.",
+        )
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        cursors = {
+            "active_cursor": "cD0yMDI2LTEwLTE4KzA5JTNBMzAlM0EwMA==",
+            "active_next_cursor": "cD0yMDI2LTEwLTE3KzA5JTNBMzAlM0EwMA==",
+            "active_previous_cursor": None,
+            "completed_cursor": None,
+            "completed_next_cursor": "cD0yMDI2LTEwLTE2KzA5JTNBMzAlM0EwMA==",
+            "completed_previous_cursor": None,
+            "task_id": 1,
+        }
+        before_menu = {
+            **cursors,
+            "full_tasks_data": [
+                sample_task(i) for i in range(1, page_size + 1)
+            ],
+            "full_completed_tasks_data": [
+                sample_task(i, completed=True)
+                for i in range(page_size + 1, 2 * page_size + 1)
+            ],
+        }
+        add_task = {
+            "category_id": 1,
+            "task_title": "Подготовить отчёт по проекту",
+            "task_description": "Собрать данные и отправить руководителю.",
+        }
+        before_add_task = {
+            **add_task,
+            "category_name": "Работа",
+            "full_categories_list": [
+                {"id": i, "name": f"Категория {i}", "slug": f"category-{i}"}
+                for i in range(1, options["categories"] + 1)
+            ],
+        }
+        before = asyncio.run(self.measure(before_menu, before_add_task))
+        after = asyncio.run(self.measure(cursors, add_task))
+        for name in ("json.dumps", "compact"):
+            self.stdout.write(
+                f"{name}: {before[name]} байт -> {after[name]} байт "
+                f"(x{before[name] / after[name]:.1f})"
+            )
+
+    async def measure(self, menu_data, add_task_data):
+        storage = MemoryStorage()
+        proxy = StorageProxy(
+            storage=storage,
+            events_isolation=DisabledEventIsolation(),
+            user_id=USER_ID,
+            chat_id=USER_ID,
+            thread_id=None,
+            business_connection_id=None,
+            bot=Bot(token="123456:measure"),
+            state_groups={},
+        )
+        contexts = [
+            Context(
+                _intent_id="menu", _stack_id="", state=MainMenu.view_tasks,
+                start_data=None, dialog_data=menu_data,
+            ),
+            Context(
+                _intent_id="add", _stack_id="", state=AddTask.input_title,
+                start_data=None, dialog_data=add_task_data,
+            ),
+        ]
+        for context in contexts:
+            await proxy.save_context(context)
+        values = [
+            record.data for record in storage.storage.values() if record.data
+        ]
+        return {
+            "json.dumps": sum(len(json.dumps(v).encode()) for v in values),
+            "compact": sum(
+                len(compact_json_dumps(v).encode()) for v in values
+            ),
+        }
@@ -0,0 +1,36 @@
+from django.core.management.commands.migrate import Command as MigrateCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+def disable_statement_timeout(sender, connection, **kwargs):
+    """Снимает statement_timeout с соединения Postgres до конца сессии."""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET statement_timeout = 0")
+
+
+class Command(MigrateCommand):
+    """
+    migrate без ограничения времени SQL-запроса.
+
+    POSTGRES_STATEMENT_TIMEOUT защищает API от долгих запросов, но
+    миграции при старте контейнера (создание индексов, изменение
+    таблицы задач) могут законно идти дольше, и оборванная на середине
+    миграция сорвала бы деплой. Поэтому на время migrate соединения
+    с базой работают с statement_timeout = 0, а после успешного
+    выполнения ограничение возвращается к значению из настроек.
+    """
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.connection is not None:
+            disable_statement_timeout(None, connection)
+        connection_created.connect(disable_statement_timeout)
+        try:
+            super().handle(*args, **options)
+        finally:
+            connection_created.disconnect(disable_statement_timeout)
+        if connection.vendor == "postgresql" and connection.connection:
+            with connection.cursor() as cursor:
+                cursor.execute("RESET statement_timeout")
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0003_alter_task_due_date"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "-created_at", "id"],
+                name="task_user_created_idx",
+            ),
+        ),
+    ]
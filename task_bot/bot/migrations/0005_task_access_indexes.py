@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0004_task_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["user", "completed", "-created_at", "id"],
+                name="task_user_completed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("completed", False), ("due_date__isnull", False)),
+                fields=["due_date"],
+                name="task_due_incomplete_idx",
+            ),
+        ),
+    ]
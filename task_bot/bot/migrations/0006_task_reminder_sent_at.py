@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0005_task_access_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="reminder_sent_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Напоминание отправлено"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("completed", False),
+                    ("due_date__isnull", False),
+                    ("reminder_sent_at__isnull", True),
+                ),
+                fields=["due_date"],
+                name="task_reminder_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 05:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bot", "0006_task_reminder_sent_at"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_due_incomplete_idx",
+        ),
+    ]
@@ -44,6 +44,9 @@ class Task(models.Model):
         null=True, blank=True, verbose_name="Срок выполнения"
     )
     completed = models.BooleanField(default=False)
+    reminder_sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Напоминание отправлено"
+    )
     category = models.ManyToManyField(Category, verbose_name="Категории")
     user = models.ForeignKey(
         User,
@@ -59,3 +62,22 @@ class Task(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "id"],
+                name="task_user_created_idx",
+            ),
+            models.Index(
+                fields=["user", "completed", "-created_at", "id"],
+                name="task_user_completed_idx",
+            ),
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(
+                    completed=False,
+                    due_date__isnull=False,
+                    reminder_sent_at__isnull=True,
+                ),
+                name="task_reminder_pending_idx",
+            ),
+        ]
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+from .config import Config, config
+
+logger = logging.getLogger(__name__)
+
+PER_CHAT_BUCKETS_LIMIT = 10000
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты: rate токенов в секунду, не больше capacity
+    токенов в запасе. acquire() ждёт, пока не появится токен.
+    pause() останавливает выдачу токенов всем ожидающим.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        if now < self.updated:
+            return
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def pause(self, seconds: float):
+        """
+        Не выдаёт токены seconds секунд, после паузы запас копится
+        с нуля.
+        """
+        self.paused_until = max(
+            self.paused_until, time.monotonic() + seconds
+        )
+        self.tokens = 0
+        self.updated = self.paused_until
+
+    @property
+    def full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                delay = self.paused_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class NotificationSender:
+    """
+    Отправляет сообщения пачками через одну сессию бота.
+
+    Держит собственный цикл событий, который живёт столько же, сколько
+    процесс воркера, поэтому HTTP-соединения с Telegram переиспользуются
+    между задачами Celery. Сообщения уходят параллельно, но не чаще
+    global_rate в секунду в целом и per_chat_rate в секунду в один чат.
+    Ответ 429 останавливает на retry_after секунд все отправки через
+    общее ведро, затем сообщение отправляется повторно.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        api_server: str = "",
+        global_rate: float = 30.0,
+        per_chat_rate: float = 1.0,
+        concurrency: int = 20,
+        max_retries: int = 3,
+    ):
+        self.token = token
+        self.api_server = api_server
+        self.per_chat_rate = per_chat_rate
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.loop = asyncio.new_event_loop()
+        self._global_rate = global_rate
+        self._global_bucket: Optional[TokenBucket] = None
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+        self._bot: Optional[Bot] = None
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    @classmethod
+    def from_config(cls, settings: Config) -> "NotificationSender":
+        notifications = settings.notifications
+        return cls(
+            token=settings.bot.token,
+            api_server=notifications.api_server,
+            global_rate=notifications.global_rate,
+            per_chat_rate=notifications.per_chat_rate,
+            concurrency=notifications.concurrency,
+            max_retries=notifications.max_retries,
+        )
+
+    @property
+    def bot(self) -> Bot:
+        if self._bot is None:
+            session = None
+            if self.api_server:
+                session = AiohttpSession(
+                    api=TelegramAPIServer.from_base(self.api_server)
+                )
+            self._bot = Bot(token=self.token, session=session)
+        return self._bot
+
+    @property
+    def global_bucket(self) -> TokenBucket:
+        # asyncio.Lock внутри ведра привязывается к циклу при первом
+        # использовании, поэтому ведро создаётся уже внутри self.loop.
+        if self._global_bucket is None:
+            self._global_bucket = TokenBucket(self._global_rate)
+        return self._global_bucket
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= PER_CHAT_BUCKETS_LIMIT:
+                self._chat_buckets = {
+                    key: value
+                    for key, value in self._chat_buckets.items()
+                    if not value.full
+                }
+            bucket = TokenBucket(self.per_chat_rate, 1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def send(self, chat_id: int, text: str) -> bool:
+        """Отправляет одно сообщение с учётом лимитов и повторов."""
+        for attempt in range(self.max_retries + 1):
+            await self._chat_bucket(chat_id).acquire()
+            await self.global_bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                self.sent += 1
+                return True
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    break
+                self.retried += 1
+                logger.warning(
+                    f"Telegram ограничил отправку в чат {chat_id}, "
+                    f"повтор через {e.retry_after} с."
+                )
+                # Ожидание касается всего бота, а не только этого чата:
+                # остальные отправки тоже ждут, а не получают 429.
+                self.global_bucket.pause(e.retry_after)
+            except TelegramAPIError as e:
+                logger.error(
+                    f"Ошибка при отправке сообщения в чат {chat_id}: {e}"
+                )
+                break
+        self.failed += 1
+        return False
+
+    async def send_many(self, messages: Iterable[Tuple[int, str]]) -> int:
+        """
+        Отправляет пары (chat_id, text) параллельно, не больше
+        concurrency запросов одновременно. Возвращает число успешных.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(chat_id, text):
+            async with semaphore:
+                try:
+                    return await self.send(chat_id, text)
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(
+                        f"Ошибка при отправке сообщения в чат {chat_id}: {e}"
+                    )
+                    return False
+
+        results = await asyncio.gather(
+            *(deliver(chat_id, text) for chat_id, text in messages)
+        )
+        return sum(results)
+
+    def send_batch(self, messages: Iterable[Tuple[int, str]]) -> int:
+        """Синхронная обёртка над send_many для задач Celery."""
+        return self.loop.run_until_complete(self.send_many(messages))
+
+    def close(self):
+        if self._bot is not None:
+            self.loop.run_until_complete(self._bot.session.close())
+            self._bot = None
+        self.loop.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+
+_sender: Optional[NotificationSender] = None
+_sender_pid: Optional[int] = None
+
+
+def get_sender() -> NotificationSender:
+    """
+    Возвращает отправителя текущего процесса. После fork воркера
+    Celery создаётся новый: цикл событий и сессию нельзя делить между
+    процессами.
+    """
+    global _sender, _sender_pid
+    if _sender is None or _sender_pid != os.getpid():
+        _sender = NotificationSender.from_config(config)
+        _sender_pid = os.getpid()
+    return _sender
+
+
+def close_sender():
+    global _sender, _sender_pid
+    if _sender is not None and _sender_pid == os.getpid():
+        logger.info(f"Статистика отправки уведомлений: {_sender.stats()}")
+        _sender.close()
+    _sender = None
+    _sender_pid = None
@@ -0,0 +1,348 @@
+import logging
+import os
+from contextvars import ContextVar
+from datetime import datetime, time
+from functools import wraps
+from typing import Dict, List, Optional
+
+import django
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Count, Q
+
+from bot.api_client import DataClient
+from bot.config import Config
+
+logger = logging.getLogger(__name__)
+
+CURSOR_SEPARATOR = "|"
+
+# Уже внутри db_operation: вложенные операции соединение не трогают.
+_in_db_operation = ContextVar("in_db_operation", default=False)
+
+
+def setup_django() -> None:
+    """Настраивает Django, если бот запущен не через manage.py."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_bot.settings")
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def db_operation(method):
+    """
+    Оборачивает обращение к базе так же, как Django оборачивает HTTP
+    запрос: close_old_connections до и после. Так закрываются
+    разорванные и устаревшие по CONN_MAX_AGE соединения, а с
+    POSTGRES_POOL соединение после операции возвращается в пул.
+    close_old_connections выполняется через sync_to_async в том же
+    потоке, где асинхронный ORM держит соединение.
+    """
+
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _in_db_operation.get():
+            return await method(*args, **kwargs)
+        token = _in_db_operation.set(True)
+        await sync_to_async(close_old_connections)()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _in_db_operation.reset(token)
+            await sync_to_async(close_old_connections)()
+
+    return wrapper
+
+
+def _encode_cursor(direction: str, row: Dict) -> str:
+    return CURSOR_SEPARATOR.join(
+        (direction, row["created_at"].isoformat(), str(row["id"]))
+    )
+
+
+def _decode_cursor(cursor: str):
+    direction, created_at, task_id = cursor.split(CURSOR_SEPARATOR)
+    return direction, datetime.fromisoformat(created_at), int(task_id)
+
+
+def _day_bound(value, end_of_day: bool = False) -> datetime:
+    """Граница диапазона дат так же, как в фильтрах API."""
+    from django.utils import timezone
+
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.max if end_of_day else time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+class OrmClient(DataClient):
+    """
+    Клиент данных, который читает и пишет задачи напрямую в базу
+    через асинхронный ORM Django, минуя HTTP и DRF.
+
+    Подходит, когда бот развёрнут рядом с базой. Списки задач
+    пагинируются по ключу (-created_at, id), как в TaskCursorPagination,
+    но курсоры у клиентов разные и между ними не переносятся.
+    Создание и изменение задач проходит через TaskSerializer, поэтому
+    проверки и побочные эффекты записи те же, что у API.
+    """
+
+    def __init__(self, **cache_options):
+        super().__init__(**cache_options)
+        setup_django()
+
+    @classmethod
+    def from_config(cls, settings: Config) -> "OrmClient":
+        """Создаёт клиент по настройкам из bot.config."""
+        return cls(**cls.cache_options(settings))
+
+    async def _task_rows(self, queryset) -> List[Dict]:
+        """JSON задач из queryset в формате списка задач API."""
+        from api.serializers import TASK_LIST_VALUES, aserialize_task_rows
+
+        return await aserialize_task_rows(
+            [row async for row in queryset.values(*TASK_LIST_VALUES)]
+        )
+
+    def _user_tasks(self, telegram_user_id: int):
+        from bot.models import Task
+
+        return Task.objects.filter(user__telegram_id=telegram_user_id)
+
+    @db_operation
+    async def _fetch_categories(
+        self, telegram_user_id: int
+    ) -> Optional[List[Dict]]:
+        from bot.models import Category
+
+        try:
+            return [
+                category async for category in
+                Category.objects.values("id", "name", "slug")
+            ]
+        except DatabaseError as e:
+            logger.error(f"Ошибка при получении категорий: {e}")
+            return None
+
+    @db_operation
+    async def _fetch_tasks(
+        self, telegram_user_id: int, filters: Dict
+    ) -> Optional[Dict]:
+        from api.serializers import TASK_LIST_VALUES, aserialize_task_rows
+
+        queryset = self._user_tasks(telegram_user_id)
+        if filters.get("completed") is not None:
+            queryset = queryset.filter(completed=filters["completed"])
+        if filters.get("due_date_after") is not None:
+            queryset = queryset.filter(
+                due_date__gte=_day_bound(filters["due_date_after"])
+            )
+        if filters.get("due_date_before") is not None:
+            queryset = queryset.filter(
+                due_date__lte=_day_bound(
+                    filters["due_date_before"], end_of_day=True
+                )
+            )
+        category = filters.get("category")
+        if category is not None:
+            if isinstance(category, int):
+                category = [category]
+            queryset = queryset.filter(category__in=category).distinct()
+
+        page_size = filters.get("page_size", self.page_size)
+        direction = "n"
+        cursor = filters.get("cursor")
+        if cursor:
+            try:
+                direction, created_at, task_id = _decode_cursor(cursor)
+            except ValueError:
+                logger.error(f"Неверный курсор списка задач: {cursor}")
+                return None
+            if direction == "n":
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at)
+                    | Q(created_at=created_at, id__gt=task_id)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at)
+                    | Q(created_at=created_at, id__lt=task_id)
+                )
+        if direction == "n":
+            queryset = queryset.order_by("-created_at", "id")
+        else:
+            queryset = queryset.order_by("created_at", "-id")
+
+        try:
+            rows = [
+                row async for row in
+                queryset.values(*TASK_LIST_VALUES)[:page_size + 1]
+            ]
+            has_more = len(rows) > page_size
+            rows = rows[:page_size]
+            if direction == "p":
+                rows.reverse()
+            tasks = await aserialize_task_rows(rows)
+        except DatabaseError as e:
+            logger.error(f"Ошибка при получении списка задач: {e}")
+            return None
+        if direction == "n":
+            has_next, has_previous = has_more, bool(cursor)
+        else:
+            has_next, has_previous = True, has_more
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = _encode_cursor("n", rows[-1])
+        if rows and has_previous:
+            previous_cursor = _encode_cursor("p", rows[0])
+        return {
+            "results": tasks,
+            "next_cursor": next_cursor,
+            "previous_cursor": previous_cursor,
+        }
+
+    @db_operation
+    async def _fetch_main_menu(
+        self, telegram_user_id: int, cursor: Optional[str]
+    ) -> Optional[Dict]:
+        from api.serializers import add_category_names
+
+        try:
+            counts = await self._user_tasks(telegram_user_id).aaggregate(
+                active=Count("id", filter=Q(completed=False)),
+                completed=Count("id", filter=Q(completed=True)),
+            )
+        except DatabaseError as e:
+            logger.error(f"Ошибка при получении главного меню: {e}")
+            return None
+        filters = {"completed": False, "page_size": self.page_size}
+        if cursor:
+            filters["cursor"] = cursor
+        data = await self._fetch_tasks(telegram_user_id, filters)
+        categories = await self._fetch_categories(telegram_user_id)
+        if data is None or categories is None:
+            return None
+        add_category_names(data["results"], categories)
+        return dict(data, categories=categories, counts=counts)
+
+    @db_operation
+    async def _fetch_task(self, task_id: int, user_id: int) -> Optional[Dict]:
+        try:
+            tasks = await self._task_rows(
+                self._user_tasks(user_id).filter(id=task_id)
+            )
+        except DatabaseError as e:
+            logger.error(f"Ошибка при получении задачи {task_id}: {e}")
+            return None
+        if not tasks:
+            logger.warning(f"Задача с ID {task_id} не найдена.")
+            return None
+        return tasks[0]
+
+    def _save_task(self, data: Dict, instance=None) -> Optional[int]:
+        """
+        Создаёт или частично обновляет задачу через TaskSerializer.
+        Синхронный: вызывается через sync_to_async.
+        """
+        from api.serializers import TaskSerializer
+
+        serializer = TaskSerializer(
+            instance, data=data, partial=instance is not None
+        )
+        if not serializer.is_valid():
+            logger.error(
+                f"Ошибка сохранения задачи: {serializer.errors}, "
+                f"Данные: {data}"
+            )
+            return None
+        with transaction.atomic():
+            return serializer.save().id
+
+    @db_operation
+    async def _create_task(
+        self, telegram_user_id: int, payload: Dict
+    ) -> Optional[Dict]:
+        from bot.models import Task
+
+        data = dict(payload, owner_tg_id=telegram_user_id)
+        if "due_date" in data:
+            data["due_date"] = data["due_date"].isoformat()
+        try:
+            task_id = await sync_to_async(self._save_task)(data)
+            if task_id is None:
+                return None
+            tasks = await self._task_rows(Task.objects.filter(id=task_id))
+        except DatabaseError as e:
+            logger.error(f"Ошибка при добавлении задачи: {e}")
+            return None
+        return tasks[0]
+
+    @db_operation
+    async def _update_task(
+        self, task_id: int, user_id: int, changes: Dict
+    ) -> Optional[Dict]:
+        try:
+            task = await self._user_tasks(user_id).filter(
+                id=task_id
+            ).afirst()
+            if task is None:
+                logger.warning(
+                    f"Не удалось обновить задачу {task_id}: не найдена."
+                )
+                return None
+            if await sync_to_async(self._save_task)(changes, task) is None:
+                return None
+            tasks = await self._task_rows(
+                self._user_tasks(user_id).filter(id=task_id)
+            )
+        except DatabaseError as e:
+            logger.error(f"Ошибка при обновлении задачи {task_id}: {e}")
+            return None
+        return tasks[0] if tasks else None
+
+    @db_operation
+    async def _delete_task(self, task_id: int, user_id: int) -> bool:
+        from bot.models import Task
+
+        try:
+            _, deleted = await self._user_tasks(user_id).filter(
+                id=task_id
+            ).adelete()
+        except DatabaseError as e:
+            logger.error(f"Ошибка при удалении задачи {task_id}: {e}")
+            return False
+        if not deleted.get(Task._meta.label):
+            logger.warning(
+                f"Не удалось удалить задачу {task_id}: не найдена."
+            )
+            return False
+        return True
+
+    @db_operation
+    async def _bulk_complete(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[Dict]:
+        tasks = self._user_tasks(user_id).filter(id__in=task_ids)
+        try:
+            updated = await tasks.aupdate(completed=True)
+            return {"updated": updated, "tasks": await self._task_rows(tasks)}
+        except DatabaseError as e:
+            logger.error(f"Ошибка массовой операции bulk_complete: {e}")
+            return None
+
+    @db_operation
+    async def _bulk_delete(
+        self, user_id: int, task_ids: List[int]
+    ) -> Optional[int]:
+        from bot.models import Task
+
+        try:
+            _, deleted = await self._user_tasks(user_id).filter(
+                id__in=task_ids
+            ).adelete()
+        except DatabaseError as e:
+            logger.error(f"Ошибка массовой операции bulk_delete: {e}")
+            return None
+        return deleted.get(Task._meta.label, 0)
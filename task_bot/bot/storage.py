@@ -0,0 +1,92 @@
+import json
+from typing import Any, Optional
+
+from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+from redis.asyncio import Redis
+
+from bot.config import Config
+
+
+def compact_json_dumps(data: Any) -> str:
+    """JSON без пробелов и с кириллицей как есть, а не \\uXXXX."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def create_storage(settings: Config) -> BaseStorage:
+    """
+    Создаёт хранилище состояний FSM и aiogram-dialog.
+
+    При FSM_STORAGE=redis состояние переживает перезапуск и доступно
+    всем репликам бота. Ключи живут FSM_STATE_TTL и FSM_DATA_TTL секунд
+    с последнего изменения, так что брошенные диалоги удаляются сами.
+    """
+    storage = settings.storage
+    if storage.backend == "redis":
+        return RedisStorage.from_url(
+            storage.redis_dsn,
+            # aiogram-dialog хранит стек и контексты под отдельными
+            # ключами, которые различаются по destiny.
+            key_builder=DefaultKeyBuilder(with_destiny=True),
+            state_ttl=storage.state_ttl or None,
+            data_ttl=storage.data_ttl or None,
+            json_dumps=compact_json_dumps,
+        )
+    return MemoryStorage()
+
+
+def create_events_isolation(
+    storage: BaseStorage,
+) -> Optional[BaseEventIsolation]:
+    """
+    Для Redis возвращает блокировки на ключ пользователя, чтобы реплики
+    не обрабатывали его обновления одновременно и не затирали данные
+    диалога друг друга. Для памяти остаётся изоляция по умолчанию.
+    """
+    if isinstance(storage, RedisStorage):
+        return storage.create_isolation()
+    return None
+
+
+class SharedVersions:
+    """
+    Номера версий задач пользователей в Redis, общие для всех реплик
+    бота.
+
+    Реплика, изменившая задачи пользователя, увеличивает номер, а
+    остальные, сравнив его со своим, понимают, что их снимки задач
+    устарели. Ключ живёт ttl секунд с последнего изменения: это должно
+    быть заметно дольше, чем живут сами снимки.
+    """
+
+    def __init__(
+        self, redis: Redis, prefix: str = "bot:tasks_version:",
+        ttl: int = 86400,
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, dsn: str, **kwargs) -> "SharedVersions":
+        return cls(Redis.from_url(dsn), **kwargs)
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.prefix}{user_id}"
+
+    async def get(self, user_id: int) -> int:
+        """Текущая версия задач пользователя, 0 — если ещё не менялись."""
+        return int(await self.redis.get(self._key(user_id)) or 0)
+
+    async def bump(self, user_id: int) -> int:
+        """Увеличивает версию задач пользователя и возвращает новую."""
+        key = self._key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, self.ttl)
+            version, _ = await pipe.execute()
+        return version
+
+    async def close(self) -> None:
+        await self.redis.aclose()
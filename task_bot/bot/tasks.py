@@ -1,32 +1,110 @@
-import asyncio
 import logging
+from collections import Counter
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Optional
 
-from aiogram import Bot
-from celery import Celery
+from celery.signals import worker_process_shutdown
 
-from .config import config
+from task_bot import celery_app
+
+from .notifications import close_sender, get_sender
 
 logger = logging.getLogger(__name__)
 
-celery_app = Celery("proj", broker=config.redis.dsn, backend=config.redis.dsn)
+DIGEST_MAX_TASKS = 30
+
+# Счётчики напоминаний процесса воркера: sent, suppressed и failed
+# в задачах, digests_sent и digests_failed в сообщениях-дайджестах.
+reminder_stats = Counter()
+
+
+@worker_process_shutdown.connect
+def _close_notification_sender(**kwargs):
+    logger.info(f"Статистика напоминаний: {dict(reminder_stats)}")
+    close_sender()
+
+
+def _notification_text(task_title: str) -> str:
+    return (
+        "🔔 НАПОМИНАНИЕ!\n\nСегодня срок выполнения вашей задачи: "
+        f"«{task_title}»"
+    )
+
+
+def _digest_text(tasks: List[Dict]) -> str:
+    from django.utils import timezone
 
+    if len(tasks) == 1 and (
+        date.fromisoformat(tasks[0]["due_date"]) <= timezone.localdate()
+    ):
+        return _notification_text(tasks[0]["title"])
+    lines = [
+        f"• «{task['title']}» — до "
+        f"{date.fromisoformat(task['due_date']):%d.%m}"
+        for task in tasks[:DIGEST_MAX_TASKS]
+    ]
+    if len(tasks) > DIGEST_MAX_TASKS:
+        lines.append(f"…и ещё {len(tasks) - DIGEST_MAX_TASKS}")
+    return "🔔 НАПОМИНАНИЕ!\n\nСроки ваших задач:\n" + "\n".join(lines)
 
-async def _send_notification(user_id: int, task_title: str):
+
+def _actual_task_ids(task_ids: List[int], dispatched_at: Optional[str]):
     """
-    Внутренняя асинхронная функция для отправки уведомления.
+    Возвращает id задач, напоминание о которых всё ещё актуально.
+
+    Одним запросом отбрасывает удалённые и выполненные задачи, а также
+    перенесённые: при смене срока reminder_sent_at сбрасывается и уже
+    не совпадает с отметкой dispatched_at, с которой напоминание было
+    поставлено в очередь.
     """
-    async with Bot(token=config.bot.token) as bot:
-        text = (
-            "🔔 НАПОМИНАНИЕ!\n\nСегодня срок выполнения вашей задачи: "
-            f"«{task_title}»"
-        )
-        await bot.send_message(chat_id=user_id, text=text)
+    from django.utils.dateparse import parse_datetime
+
+    from bot.models import Task
+
+    tasks = Task.objects.filter(id__in=task_ids, completed=False)
+    if dispatched_at is None:
+        tasks = tasks.filter(reminder_sent_at__isnull=False)
+    else:
+        tasks = tasks.filter(reminder_sent_at=parse_datetime(dispatched_at))
+    return set(tasks.values_list("id", flat=True))
+
+
+def _task_is_open(task_id: int) -> bool:
+    from bot.models import Task
+
+    return Task.objects.filter(id=task_id, completed=False).exists()
+
+
+def _count_reminders(sent: int, suppressed: int, failed: int):
+    reminder_stats.update(sent=sent, suppressed=suppressed, failed=failed)
+    logger.info(
+        f"Напоминания: отправлено {sent}, отброшено {suppressed}, "
+        f"не доставлено {failed}."
+    )
+
+
+def _count_digests(sent: int, suppressed: int, failed: int):
+    """sent и failed — дайджесты, suppressed — отброшенные задачи."""
+    reminder_stats.update(
+        digests_sent=sent, suppressed=suppressed, digests_failed=failed
+    )
+    logger.info(
+        f"Дайджесты: отправлено {sent}, не доставлено {failed}, "
+        f"отброшено задач {suppressed}."
+    )
 
 
 @celery_app.task
-def send_task_notification(user_id: int, task_title: str):
+def send_task_notification(
+    user_id: int, task_title: str, task_id: Optional[int] = None
+):
     """
     Синхронная задача Celery для отправки уведомления.
+
+    Если передан task_id, уведомление о выполненной или удалённой
+    задаче не отправляется.
     """
     logger.info(
         f"Запускаю отправку уведомления для задачи «{task_title}»"
@@ -35,11 +113,20 @@ def send_task_notification(user_id: int, task_title: str):
     status = "failure"
     error_info = None
     try:
-        asyncio.run(_send_notification(user_id, task_title))
-        logger.info(
-            f"Уведомление для пользователя {user_id} "
-            "успешно отправлено.")
-        status = "success"
+        if task_id is not None and not _task_is_open(task_id):
+            _count_reminders(0, 1, 0)
+            status = "suppressed"
+        elif get_sender().send_batch(
+            [(user_id, _notification_text(task_title))]
+        ):
+            _count_reminders(1, 0, 0)
+            logger.info(
+                f"Уведомление для пользователя {user_id} "
+                "успешно отправлено.")
+            status = "success"
+        else:
+            _count_reminders(0, 0, 1)
+            error_info = "Сообщение не доставлено"
     except Exception as e:
         logger.error(
             f"Ошибка при отправке уведомления пользователю {user_id}: {e}",
@@ -52,3 +139,242 @@ def send_task_notification(user_id: int, task_title: str):
         f"{user_id} завершена."
     )
     return {"status": status, "user_id": user_id, "error": error_info}
+
+
+@celery_app.task
+def send_task_reminders(
+    reminders: List[Dict], dispatched_at: Optional[str] = None
+):
+    """
+    Отправляет пачку напоминаний, выбранных dispatch_due_reminders.
+
+    Каждый элемент — словарь с ключами task_id, user_id и title.
+    Перед отправкой напоминания сверяются с базой одним запросом,
+    неактуальные отбрасываются. Сообщения уходят параллельно через
+    отправителя процесса воркера с учётом лимитов Telegram.
+    """
+    total = len(reminders)
+    actual = _actual_task_ids(
+        [reminder["task_id"] for reminder in reminders], dispatched_at
+    )
+    reminders = [
+        reminder for reminder in reminders if reminder["task_id"] in actual
+    ]
+    sent = get_sender().send_batch(
+        (reminder["user_id"], _notification_text(reminder["title"]))
+        for reminder in reminders
+    )
+    _count_reminders(sent, total - len(reminders), len(reminders) - sent)
+    return {
+        "sent": sent,
+        "total": total,
+        "suppressed": total - len(reminders),
+    }
+
+
+@celery_app.task
+def send_reminder_digests(
+    digests: List[Dict], dispatched_at: Optional[str] = None
+):
+    """
+    Отправляет дайджесты, собранные dispatch_due_reminders: по одному
+    сообщению на пользователя.
+
+    Каждый элемент — словарь с ключами user_id и tasks, где tasks —
+    список словарей с ключами task_id, title и due_date. Неактуальные
+    задачи убираются из дайджеста, пустые дайджесты не отправляются.
+    """
+    actual = _actual_task_ids(
+        [task["task_id"] for digest in digests for task in digest["tasks"]],
+        dispatched_at,
+    )
+    total = sum(len(digest["tasks"]) for digest in digests)
+    digests = [
+        {
+            **digest,
+            "tasks": [
+                task for task in digest["tasks"] if task["task_id"] in actual
+            ],
+        }
+        for digest in digests
+    ]
+    digests = [digest for digest in digests if digest["tasks"]]
+    sent = get_sender().send_batch(
+        (digest["user_id"], _digest_text(digest["tasks"]))
+        for digest in digests
+    )
+    _count_digests(sent, total - len(actual), len(digests) - sent)
+    return {
+        "sent": sent,
+        "total": len(digests),
+        "suppressed": total - len(actual),
+    }
+
+
+@celery_app.task(acks_late=True, reject_on_worker_lost=True)
+def dispatch_due_reminders():
+    """
+    Периодическая задача (celery beat): находит невыполненные задачи,
+    для которых наступило время напоминания, и ставит их отправку
+    пачками по REMINDER_BATCH_SIZE.
+
+    Подтверждается после выполнения: повторный запуск после падения
+    воркера не ставит уже помеченные reminder_sent_at задачи ещё раз.
+
+    Напоминание приходит в REMINDER_HOUR по местному времени в день
+    срока выполнения. Выборка идёт по частичному индексу
+    task_reminder_pending_idx в окне последних REMINDER_LOOKBACK_HOURS,
+    задачи помечаются reminder_sent_at в той же транзакции, поэтому
+    очередь содержит только то, что нужно отправить сейчас.
+
+    При REMINDER_DIGEST_ENABLED напоминания группируются по
+    пользователям, см. _dispatch_digests.
+    """
+    from django.conf import settings
+    from django.utils import timezone
+
+    now = timezone.now()
+    remind_before = now - timedelta(hours=settings.REMINDER_HOUR)
+    remind_after = remind_before - timedelta(
+        hours=settings.REMINDER_LOOKBACK_HOURS
+    )
+    if settings.REMINDER_DIGEST_ENABLED:
+        dispatched = _dispatch_digests(now, remind_after, remind_before)
+    else:
+        dispatched = _dispatch_reminders(now, remind_after, remind_before)
+    logger.info(f"Поставлено в очередь напоминаний: {dispatched}.")
+    return {"dispatched": dispatched}
+
+
+def _pending_reminders():
+    from bot.models import Task
+
+    return Task.objects.filter(
+        completed=False,
+        due_date__isnull=False,
+        reminder_sent_at__isnull=True,
+    )
+
+
+def _dispatch_reminders(now, remind_after, remind_before) -> int:
+    """Ставит по одному сообщению на каждую задачу."""
+    from django.conf import settings
+    from django.db import transaction
+
+    from bot.models import Task
+
+    batch_size = settings.REMINDER_BATCH_SIZE
+    dispatched = 0
+    for _ in range(settings.REMINDER_MAX_BATCHES):
+        with transaction.atomic():
+            rows = list(
+                _pending_reminders()
+                .select_for_update(skip_locked=True, of=("self",))
+                .filter(
+                    due_date__gt=remind_after,
+                    due_date__lte=remind_before,
+                    user__telegram_id__isnull=False,
+                )
+                .order_by("due_date")
+                .values_list("id", "title", "user__telegram_id")[:batch_size]
+            )
+            if not rows:
+                break
+            Task.objects.filter(id__in=[row[0] for row in rows]).update(
+                reminder_sent_at=now
+            )
+            reminders = [
+                {"task_id": task_id, "user_id": user_id, "title": title}
+                for task_id, title, user_id in rows
+            ]
+            transaction.on_commit(
+                lambda reminders=reminders: send_task_reminders.delay(
+                    reminders, now.isoformat()
+                )
+            )
+        dispatched += len(rows)
+        if len(rows) < batch_size:
+            break
+    return dispatched
+
+
+def _dispatch_digests(now, remind_after, remind_before) -> int:
+    """
+    Ставит по одному дайджесту на пользователя.
+
+    Одним запросом, упорядоченным по пользователю, выбираются задачи
+    тех пользователей, у которых наступило время хотя бы одного
+    напоминания: все просроченные в окне REMINDER_LOOKBACK_HOURS и все
+    со сроком в ближайшие REMINDER_DIGEST_WINDOW_HOURS. Попавшие
+    в дайджест задачи помечаются reminder_sent_at и отдельно уже
+    не напоминаются. Задачи пользователя не делятся между пачками,
+    если только их не больше REMINDER_BATCH_SIZE.
+    """
+    from django.conf import settings
+    from django.db import transaction
+    from django.db.models import Exists, OuterRef
+    from django.utils import timezone
+
+    from bot.models import Task
+
+    due_now = _pending_reminders().filter(
+        user=OuterRef("user"),
+        due_date__gt=remind_after,
+        due_date__lte=remind_before,
+    )
+    window_end = remind_before + timedelta(
+        hours=settings.REMINDER_DIGEST_WINDOW_HOURS
+    )
+    batch_size = settings.REMINDER_BATCH_SIZE
+    dispatched = 0
+    for _ in range(settings.REMINDER_MAX_BATCHES):
+        with transaction.atomic():
+            rows = list(
+                _pending_reminders()
+                .select_for_update(skip_locked=True, of=("self",))
+                .filter(
+                    Exists(due_now),
+                    due_date__gt=remind_after,
+                    due_date__lte=window_end,
+                    user__telegram_id__isnull=False,
+                )
+                .order_by("user_id", "due_date", "id")
+                .values_list(
+                    "id", "title", "due_date", "user__telegram_id"
+                )[:batch_size]
+            )
+            if not rows:
+                break
+            full_batch = len(rows) == batch_size
+            if full_batch and rows[0][3] != rows[-1][3]:
+                # Задачи последнего пользователя могли не поместиться
+                # в пачку целиком: он попадёт в следующую.
+                rows = [row for row in rows if row[3] != rows[-1][3]]
+            Task.objects.filter(id__in=[row[0] for row in rows]).update(
+                reminder_sent_at=now
+            )
+            digests = [
+                {
+                    "user_id": user_id,
+                    "tasks": [
+                        {
+                            "task_id": task_id,
+                            "title": title,
+                            "due_date": timezone.localdate(
+                                due_date
+                            ).isoformat(),
+                        }
+                        for task_id, title, due_date, _ in user_rows
+                    ],
+                }
+                for user_id, user_rows in groupby(rows, key=itemgetter(3))
+            ]
+            transaction.on_commit(
+                lambda digests=digests: send_reminder_digests.delay(
+                    digests, now.isoformat()
+                )
+            )
+        dispatched += len(rows)
+        if not full_batch:
+            break
+    return dispatched
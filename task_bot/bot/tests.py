@@ -0,0 +1,659 @@
+import asyncio
+import io
+import threading
+import time
+from datetime import date, timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import (SimpleTestCase, TestCase, TransactionTestCase,
+                         override_settings, skipUnlessDBFeature)
+from django.utils import timezone
+
+from api.serializers import TaskSerializer
+from bot import tasks as reminder_tasks
+from bot.api_client import SingleFlight
+from bot.cache import TaskPage, TaskSnapshot, TTLCache
+from bot.models import Task, User
+from bot.notifications import TokenBucket
+from bot.tasks import (_digest_text, dispatch_due_reminders,
+                       send_reminder_digests, send_task_notification,
+                       send_task_reminders)
+
+
+@override_settings(
+    REMINDER_HOUR=19,
+    REMINDER_LOOKBACK_HOURS=24,
+    REMINDER_BATCH_SIZE=200,
+    REMINDER_MAX_BATCHES=50,
+    REMINDER_DIGEST_ENABLED=False,
+)
+class ReminderDispatchTests(TestCase):
+    """
+    Проверяет планировщик напоминаний dispatch_due_reminders: выборку
+    по окну, пачки, отметку reminder_sent_at и постановку в очередь
+    после коммита.
+    """
+
+    TELEGRAM_ID = 2001
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+
+    def create_task(self, hours_since_reminder, **kwargs):
+        """
+        Задача, время напоминания которой (срок + REMINDER_HOUR)
+        наступило hours_since_reminder часов назад; отрицательное
+        значение — ещё не наступило.
+        """
+        due_date = timezone.now() - timedelta(
+            hours=19 + hours_since_reminder
+        )
+        return Task.objects.create(
+            title=f"Задача {Task.objects.count()}",
+            due_date=due_date,
+            user=kwargs.pop("user", self.user),
+            **kwargs,
+        )
+
+    def dispatch(self):
+        """Запускает планировщик и возвращает поставленные пачки."""
+        with patch.object(send_task_reminders, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                result = dispatch_due_reminders()
+        self.assertEqual(len(callbacks), delay.call_count)
+        return result, [call.args[0] for call in delay.call_args_list]
+
+    def test_only_due_tasks_are_dispatched(self):
+        due = self.create_task(1)
+        not_yet_due = self.create_task(-1)
+        completed = self.create_task(1, completed=True)
+        without_telegram = self.create_task(
+            1, user=User.objects.create(username="no-telegram")
+        )
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 1})
+        self.assertEqual(
+            batches,
+            [[{
+                "task_id": due.id,
+                "user_id": self.TELEGRAM_ID,
+                "title": due.title,
+            }]],
+        )
+        due.refresh_from_db()
+        self.assertIsNotNone(due.reminder_sent_at)
+        for task in (not_yet_due, completed, without_telegram):
+            task.refresh_from_db()
+            self.assertIsNone(task.reminder_sent_at)
+
+    def test_lookback_window(self):
+        inside = self.create_task(23)
+        outside = self.create_task(25)
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 1})
+        self.assertEqual(
+            [reminder["task_id"] for reminder in batches[0]], [inside.id]
+        )
+        outside.refresh_from_db()
+        self.assertIsNone(outside.reminder_sent_at)
+
+    @override_settings(REMINDER_BATCH_SIZE=2, REMINDER_MAX_BATCHES=2)
+    def test_batch_size_limit(self):
+        tasks = [self.create_task(hours) for hours in (5, 4, 3, 2, 1)]
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 4})
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+        # Пачки идут по сроку, самые ранние первыми.
+        self.assertEqual(
+            [reminder["task_id"] for batch in batches for reminder in batch],
+            [task.id for task in tasks[:4]],
+        )
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 1})
+        self.assertEqual(batches[0][0]["task_id"], tasks[4].id)
+
+    def test_second_run_does_not_enqueue_again(self):
+        self.create_task(1)
+        self.dispatch()
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 0})
+        self.assertEqual(batches, [])
+
+    def test_only_idempotent_tasks_ack_late(self):
+        # Повторная доставка планировщика безопасна (см. тест выше),
+        # а повторная отправка напоминаний пришла бы пользователю дважды.
+        self.assertTrue(dispatch_due_reminders.acks_late)
+        self.assertTrue(dispatch_due_reminders.reject_on_worker_lost)
+        for task in (
+            send_task_notification, send_task_reminders,
+            send_reminder_digests,
+        ):
+            with self.subTest(task=task.name):
+                self.assertFalse(task.acks_late)
+                self.assertFalse(task.reject_on_worker_lost)
+
+    def test_nothing_is_enqueued_on_rollback(self):
+        task = self.create_task(1)
+        with patch.object(send_task_reminders, "delay") as delay:
+            with self.captureOnCommitCallbacks() as callbacks:
+                with transaction.atomic():
+                    dispatch_due_reminders()
+                    transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+        delay.assert_not_called()
+        task.refresh_from_db()
+        self.assertIsNone(task.reminder_sent_at)
+
+
+@override_settings(
+    REMINDER_HOUR=19,
+    REMINDER_LOOKBACK_HOURS=24,
+    REMINDER_BATCH_SIZE=200,
+    REMINDER_MAX_BATCHES=50,
+    REMINDER_DIGEST_ENABLED=True,
+    REMINDER_DIGEST_WINDOW_HOURS=24,
+)
+class ReminderDigestTests(TestCase):
+    """
+    Проверяет режим дайджестов: группировку по пользователям, окно
+    ближайших сроков и подсчёт отправленного.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.other = (
+            User.objects.create(username=str(tg_id), telegram_id=tg_id)
+            for tg_id in (3001, 3002)
+        )
+
+    create_task = ReminderDispatchTests.create_task
+
+    def dispatch(self):
+        with patch.object(send_reminder_digests, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = dispatch_due_reminders()
+        return result, [call.args[0] for call in delay.call_args_list]
+
+    def digest_task_ids(self, digest):
+        return [task["task_id"] for task in digest["tasks"]]
+
+    def test_digest_groups_due_and_upcoming_tasks(self):
+        due = self.create_task(1)
+        upcoming = self.create_task(-10)
+        beyond_window = self.create_task(-30)
+        # У второго пользователя напоминание ещё не наступило.
+        other_upcoming = self.create_task(-5, user=self.other)
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 2})
+        self.assertEqual(len(batches), 1)
+        [digest] = batches[0]
+        self.assertEqual(digest["user_id"], self.user.telegram_id)
+        self.assertEqual(
+            self.digest_task_ids(digest), [due.id, upcoming.id]
+        )
+        self.assertEqual(
+            digest["tasks"][1]["due_date"],
+            timezone.localdate(upcoming.due_date).isoformat(),
+        )
+        for task in (due, upcoming):
+            task.refresh_from_db()
+            self.assertIsNotNone(task.reminder_sent_at)
+        for task in (beyond_window, other_upcoming):
+            task.refresh_from_db()
+            self.assertIsNone(task.reminder_sent_at)
+
+        # Задача из окна уже в дайджесте и отдельно не напоминается.
+        self.assertEqual(self.dispatch(), ({"dispatched": 0}, []))
+
+    @override_settings(REMINDER_BATCH_SIZE=3)
+    def test_user_tasks_are_not_split_between_batches(self):
+        first = [self.create_task(hours) for hours in (3, 2)]
+        second = [
+            self.create_task(hours, user=self.other) for hours in (3, 2)
+        ]
+
+        result, batches = self.dispatch()
+
+        self.assertEqual(result, {"dispatched": 4})
+        self.assertEqual(
+            [
+                [self.digest_task_ids(digest) for digest in batch]
+                for batch in batches
+            ],
+            [
+                [[task.id for task in first]],
+                [[task.id for task in second]],
+            ],
+        )
+
+    def test_digest_text_uses_local_date(self):
+        class ContainerDate(date):
+            """Часовой пояс контейнера отстаёт от TIME_ZONE на сутки."""
+
+            @classmethod
+            def today(cls):
+                return timezone.localdate() - timedelta(days=1)
+
+        today = timezone.localdate()
+        with patch.object(reminder_tasks, "date", ContainerDate):
+            single_today = _digest_text(
+                [{"task_id": 1, "title": "Сегодня", "due_date": str(today)}]
+            )
+        self.assertIn("Сегодня срок выполнения", single_today)
+        tomorrow = str(today + timedelta(days=1))
+        single_tomorrow = _digest_text(
+            [{"task_id": 1, "title": "Завтра", "due_date": tomorrow}]
+        )
+        self.assertIn("Сроки ваших задач", single_tomorrow)
+
+    def test_digest_stats_count_messages_and_tasks_separately(self):
+        now = timezone.now()
+        tasks = [self.create_task(1, reminder_sent_at=now) for _ in range(3)]
+        Task.objects.filter(id=tasks[0].id).update(completed=True)
+        digests = [
+            {
+                "user_id": self.user.telegram_id,
+                "tasks": [
+                    {
+                        "task_id": task.id,
+                        "title": task.title,
+                        "due_date": str(timezone.localdate()),
+                    }
+                    for task in tasks
+                ],
+            }
+        ]
+        stats_before = reminder_tasks.reminder_stats.copy()
+
+        with patch.object(reminder_tasks, "get_sender") as get_sender:
+            get_sender.return_value.send_batch.side_effect = (
+                lambda messages: len(list(messages))
+            )
+            result = send_reminder_digests(digests, now.isoformat())
+
+        self.assertEqual(
+            result, {"sent": 1, "total": 1, "suppressed": 1}
+        )
+        stats = reminder_tasks.reminder_stats - stats_before
+        self.assertEqual(stats, {"digests_sent": 1, "suppressed": 1})
+
+
+@override_settings(
+    REMINDER_HOUR=19,
+    REMINDER_LOOKBACK_HOURS=24,
+    REMINDER_BATCH_SIZE=200,
+    REMINDER_MAX_BATCHES=50,
+    REMINDER_DIGEST_ENABLED=False,
+)
+class ReminderSuppressionTests(TestCase):
+    """
+    Проверяет, что send_task_reminders не отправляет напоминания
+    о задачах, которые изменились после постановки в очередь.
+    """
+
+    TELEGRAM_ID = 4001
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username=str(cls.TELEGRAM_ID), telegram_id=cls.TELEGRAM_ID
+        )
+
+    create_task = ReminderDispatchTests.create_task
+
+    def dispatch(self):
+        """Возвращает поставленные пачки и отметку dispatched_at."""
+        with patch.object(send_task_reminders, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                dispatch_due_reminders()
+        return [call.args for call in delay.call_args_list]
+
+    def update_task(self, task, **data):
+        serializer = TaskSerializer(task, data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def send(self, reminders, dispatched_at):
+        """Отправляет пачку и возвращает результат и прирост счётчиков."""
+        stats_before = reminder_tasks.reminder_stats.copy()
+        with patch.object(reminder_tasks, "get_sender") as get_sender:
+            send_batch = get_sender.return_value.send_batch
+            send_batch.side_effect = lambda messages: len(list(messages))
+            result = send_task_reminders(reminders, dispatched_at)
+        return result, reminder_tasks.reminder_stats - stats_before
+
+    def test_changed_tasks_are_suppressed(self):
+        completed, deleted, rescheduled, actual = (
+            self.create_task(hours) for hours in (4, 3, 2, 1)
+        )
+        [(reminders, dispatched_at)] = self.dispatch()
+        self.assertEqual(len(reminders), 4)
+
+        self.update_task(completed, completed=True)
+        deleted.delete()
+        self.update_task(
+            rescheduled, due_date=timezone.now() + timedelta(days=3)
+        )
+
+        with patch.object(reminder_tasks, "_notification_text") as text:
+            result, stats = self.send(reminders, dispatched_at)
+
+        self.assertEqual(
+            result, {"sent": 1, "total": 4, "suppressed": 3}
+        )
+        self.assertEqual(stats, {"sent": 1, "suppressed": 3})
+        text.assert_called_once_with(actual.title)
+
+    def test_rescheduled_and_dispatched_again_is_sent_once(self):
+        task = self.create_task(1)
+        [(old_reminders, old_dispatched_at)] = self.dispatch()
+        # Срок сдвинут на час, напоминание снова наступило и поставлено
+        # в очередь уже с новой отметкой.
+        self.update_task(task, due_date=task.due_date - timedelta(hours=1))
+        [(new_reminders, new_dispatched_at)] = self.dispatch()
+        self.assertNotEqual(old_dispatched_at, new_dispatched_at)
+
+        old_result, old_stats = self.send(old_reminders, old_dispatched_at)
+        new_result, new_stats = self.send(new_reminders, new_dispatched_at)
+
+        self.assertEqual(old_result["sent"], 0)
+        self.assertEqual(old_stats, {"suppressed": 1})
+        self.assertEqual(new_result["sent"], 1)
+        self.assertEqual(new_stats, {"sent": 1})
+
+
+@override_settings(
+    REMINDER_HOUR=19,
+    REMINDER_LOOKBACK_HOURS=24,
+    REMINDER_DIGEST_ENABLED=False,
+)
+@skipUnlessDBFeature("has_select_for_update_skip_locked")
+class ReminderDispatchLockingTests(TransactionTestCase):
+    """
+    Проверяет, что параллельный планировщик пропускает строки,
+    заблокированные другим, а не ждёт их.
+    """
+
+    def test_locked_tasks_are_skipped(self):
+        user = User.objects.create(username="2002", telegram_id=2002)
+        due_date = timezone.now() - timedelta(hours=20)
+        locked, free = (
+            Task.objects.create(title=title, due_date=due_date, user=user)
+            for title in ("Заблокирована", "Свободна")
+        )
+        row_locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    list(
+                        Task.objects.select_for_update().filter(id=locked.id)
+                    )
+                    row_locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            self.assertTrue(row_locked.wait(10))
+            with patch.object(send_task_reminders, "delay") as delay:
+                result = dispatch_due_reminders()
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual(result, {"dispatched": 1})
+        self.assertEqual(
+            [reminder["task_id"] for reminder in delay.call_args.args[0]],
+            [free.id],
+        )
+        locked.refresh_from_db()
+        self.assertIsNone(locked.reminder_sent_at)
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Проверяет общую паузу ведра после ответа 429."""
+
+    def test_pause_blocks_all_waiters(self):
+        async def run():
+            bucket = TokenBucket(rate=1000, capacity=10)
+            started = time.monotonic()
+            bucket.pause(0.1)
+            await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+            return time.monotonic() - started, bucket.tokens
+
+        elapsed, tokens = asyncio.run(run())
+        self.assertGreaterEqual(elapsed, 0.1)
+        # После паузы запас копится с нуля, а не выдаётся разом.
+        self.assertLess(tokens, 10)
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Проверяет объединение одинаковых одновременных запросов."""
+
+    async def test_concurrent_callers_share_call(self):
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"tasks": []}
+
+        waiters = [
+            asyncio.ensure_future(flight.do("menu", fetch)) for _ in range(3)
+        ]
+        other = asyncio.ensure_future(flight.do("other", fetch))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, other)
+        self.assertEqual(calls, 2)
+        self.assertIs(results[0], results[1])
+        self.assertIs(results[0], results[2])
+        self.assertEqual(
+            flight.stats(), {"calls": 2, "coalesced": 2, "in_flight": 0}
+        )
+
+    async def test_exception_reaches_every_waiter_and_is_not_cached(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise ConnectionError("backend недоступен")
+
+        async def succeed():
+            return "ok"
+
+        waiters = [
+            asyncio.ensure_future(flight.do("menu", fail)) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        for result in results:
+            self.assertIsInstance(result, ConnectionError)
+        self.assertEqual(await flight.do("menu", succeed), "ok")
+
+    async def test_cancelled_waiter_does_not_cancel_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do("menu", fetch))
+        second = asyncio.ensure_future(flight.do("menu", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        self.assertEqual(await second, "ok")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(flight.stats()["calls"], 1)
+
+
+class TTLCacheTests(SimpleTestCase):
+    """Проверяет вытеснение LRU и время жизни записей TTLCache."""
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.peek("b"))
+        self.assertEqual(cache.peek("a"), 1)
+        self.assertEqual(cache.peek("c"), 3)
+
+    def test_peek_does_not_refresh_order(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.peek("a")
+        cache.set("c", 3)
+        self.assertNotIn("a", cache)
+
+    @patch("bot.cache.time.monotonic")
+    def test_entries_expire_after_ttl(self, monotonic):
+        monotonic.return_value = 100.0
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("a", 1)
+        monotonic.return_value = 130.0
+        self.assertEqual(cache.get("a"), 1)
+        monotonic.return_value = 130.5
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "size": 0})
+
+
+def snapshot_task(task_id, day):
+    """Задача списка с created_at в указанный день января."""
+    return {"id": task_id, "created_at": f"2026-01-{day:02d}T12:00:00Z"}
+
+
+class TaskSnapshotTests(SimpleTestCase):
+    """
+    Проверяет, куда TaskSnapshot.upsert кладёт задачи: список идёт
+    от новых к старым, загружены первые две страницы из трёх.
+    """
+
+    def setUp(self):
+        self.snapshot = TaskSnapshot(pages={
+            None: TaskPage(
+                tasks=[snapshot_task(1, 20), snapshot_task(2, 18)],
+                next_cursor="page-2",
+            ),
+            "page-2": TaskPage(
+                tasks=[snapshot_task(3, 14), snapshot_task(4, 12)],
+                next_cursor="page-3",
+                previous_cursor="page-1",
+            ),
+        })
+
+    def page_ids(self, cursor):
+        return [task["id"] for task in self.snapshot.pages[cursor].tasks]
+
+    def test_insert_at_head(self):
+        self.snapshot.upsert(snapshot_task(5, 25))
+        self.assertEqual(self.page_ids(None), [5, 1, 2])
+
+    def test_insert_inside_page(self):
+        self.snapshot.upsert(snapshot_task(5, 13))
+        self.assertEqual(self.page_ids("page-2"), [3, 5, 4])
+        self.assertEqual(self.page_ids(None), [1, 2])
+
+    def test_insert_between_pages_drops_pages(self):
+        self.snapshot.upsert(snapshot_task(5, 16))
+        self.assertEqual(self.snapshot.pages, {})
+
+    def test_insert_after_loaded_pages(self):
+        # Её принесёт загрузка третьей страницы.
+        self.snapshot.upsert(snapshot_task(5, 10))
+        self.assertIsNone(self.snapshot.get(5))
+        self.assertEqual(self.page_ids("page-2"), [3, 4])
+
+    def test_insert_after_last_page(self):
+        self.snapshot.pages["page-2"].next_cursor = None
+        self.snapshot.upsert(snapshot_task(5, 10))
+        self.assertEqual(self.page_ids("page-2"), [3, 4, 5])
+
+    def test_update_in_place(self):
+        task = dict(snapshot_task(3, 14), title="Новое название")
+        self.snapshot.upsert(task)
+        self.assertIs(self.snapshot.get(3), task)
+        self.assertEqual(self.page_ids("page-2"), [3, 4])
+
+    def test_remove(self):
+        self.snapshot.remove(2)
+        self.snapshot.remove(99)
+        self.assertIsNone(self.snapshot.get(2))
+        self.assertEqual(self.page_ids(None), [1])
+        self.assertEqual(self.page_ids("page-2"), [3, 4])
+
+
+class BenchmarkCommandTests(TestCase):
+    """
+    Прогоняет команды замеров на крошечных объёмах, чтобы изменения
+    представлений не ломали их незаметно.
+    """
+
+    def test_benchmark_task_serialization(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_task_serialization",
+            tasks=5, page_size=5, requests=2, stdout=out,
+        )
+        self.assertIn("TaskSerializer:", out.getvalue())
+        self.assertIn("fast path:", out.getvalue())
+        self.assertIn("Ускорение", out.getvalue())
+
+
+class MigrateCommandTests(TestCase):
+    """Проверяет, что migrate не ограничен POSTGRES_STATEMENT_TIMEOUT."""
+
+    @skipUnless(
+        connection.vendor == "postgresql", "statement_timeout есть в Postgres"
+    )
+    def test_migrate_runs_without_statement_timeout(self):
+        def show_timeout():
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW statement_timeout")
+                return cursor.fetchone()[0]
+
+        configured = show_timeout()
+        during = []
+        with patch(
+            "django.core.management.commands.migrate.Command.handle",
+            side_effect=lambda *args, **options: during.append(
+                show_timeout()
+            ),
+        ):
+            call_command("migrate", verbosity=0)
+        self.assertEqual(during, ["0"])
+        self.assertEqual(show_timeout(), configured)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import (SimpleRequestHandler,
+                                            setup_application)
+from aiohttp import web
+
+from bot.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LimitedRequestHandler(SimpleRequestHandler):
+    """
+    Принимает обновления от Telegram и обрабатывает их в фоне,
+    не больше max_concurrent одновременно (0 — без ограничения).
+
+    Telegram получает ответ сразу, остальные обновления ждут
+    своей очереди в памяти процесса.
+    """
+
+    def __init__(self, *args, max_concurrent: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        if max_concurrent:
+            self._semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def _background_feed_update(
+        self, bot: Bot, update: Dict[str, Any]
+    ) -> None:
+        if self._semaphore is None:
+            return await super()._background_feed_update(bot, update)
+        async with self._semaphore:
+            return await super()._background_feed_update(bot, update)
+
+
+async def healthcheck(request: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+def create_webhook_app(
+    bot: Bot, dispatcher: Dispatcher, settings: Config
+) -> web.Application:
+    """
+    Собирает aiohttp-приложение для приёма обновлений.
+
+    Состояние диалогов хранится вне процесса, поэтому таких приложений
+    можно запустить несколько за балансировщиком.
+    """
+    webhook = settings.webhook
+
+    async def set_webhook(bot: Bot):
+        await bot.set_webhook(
+            url=webhook.base_url.rstrip("/") + webhook.path,
+            secret_token=webhook.secret or None,
+            max_connections=webhook.max_connections,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+        )
+        logger.info(f"Webhook установлен: {webhook.base_url}{webhook.path}")
+
+    if webhook.base_url:
+        dispatcher.startup.register(set_webhook)
+
+    app = web.Application()
+    LimitedRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=webhook.secret or None,
+        max_concurrent=settings.bot.max_concurrent_updates,
+    ).register(app, path=webhook.path)
+    app.router.add_get("/healthz", healthcheck)
+    setup_application(app, dispatcher, bot=bot)
+    return app
+
+
+def run_webhook(bot: Bot, dispatcher: Dispatcher, settings: Config):
+    if not settings.webhook.secret:
+        logger.warning(
+            "WEBHOOK_SECRET не задан: запросы к webhook не проверяются."
+        )
+    app = create_webhook_app(bot, dispatcher, settings)
+    web.run_app(
+        app,
+        host=settings.webhook.host,
+        port=settings.webhook.port,
+        access_log=None,
+    )
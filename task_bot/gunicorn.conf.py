@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+
+# Продакшен-запуск backend:
+#   gunicorn task_bot.asgi:application -c gunicorn.conf.py
+# Каждый воркер — процесс uvicorn со своим циклом событий, поэтому
+# воркеров нужно примерно столько же, сколько ядер.
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Держим соединение дольше, чем клиент бота (API_KEEPALIVE_TIMEOUT):
+# тогда простаивающее соединение закрывает клиент, и он не отправит
+# запрос в уже закрытый сервером сокет.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
@@ -24,6 +24,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Сжатие ответов API: brotli, если клиент его принимает, иначе gzip.
+    "api.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -54,6 +56,32 @@ WSGI_APPLICATION = "task_bot.wsgi.application"
 DATABASE_CHOICE = os.getenv("DATABASE_CHOICE", "sqlite").lower()
 
 if DATABASE_CHOICE == "postgres":
+    # Пул соединений psycopg: у каждого процесса (воркер gunicorn,
+    # процесс Celery) свой пул от POSTGRES_POOL_MIN_SIZE до
+    # POSTGRES_POOL_MAX_SIZE соединений, так что суммарный максимум
+    # должен укладываться в max_connections Postgres. Запрос ждёт
+    # свободное соединение не дольше POSTGRES_POOL_TIMEOUT секунд.
+    # Пул несовместим с CONN_MAX_AGE: без пула соединения живут
+    # POSTGRES_CONN_MAX_AGE секунд.
+    POSTGRES_POOL = os.getenv("POSTGRES_POOL", "true").lower() in (
+        "1", "true", "yes"
+    )
+    POSTGRES_OPTIONS = {}
+    if POSTGRES_POOL:
+        POSTGRES_OPTIONS["pool"] = {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", 10)),
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", 10)),
+        }
+    # Ограничение времени одного SQL-запроса в миллисекундах, 0 — без
+    # ограничения. На migrate не действует (см. команду migrate в bot).
+    POSTGRES_STATEMENT_TIMEOUT = int(
+        os.getenv("POSTGRES_STATEMENT_TIMEOUT", 30000)
+    )
+    if POSTGRES_STATEMENT_TIMEOUT:
+        POSTGRES_OPTIONS["options"] = (
+            f"-c statement_timeout={POSTGRES_STATEMENT_TIMEOUT}"
+        )
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.postgresql",
@@ -62,6 +90,16 @@ if DATABASE_CHOICE == "postgres":
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
             "HOST": os.getenv("POSTGRES_HOST", ""),
             "PORT": os.getenv("POSTGRES_PORT", 5432),
+            "CONN_MAX_AGE": (
+                0 if POSTGRES_POOL
+                else int(os.getenv("POSTGRES_CONN_MAX_AGE", 60))
+            ),
+            # С пулом проверку выполняет psycopg при выдаче соединения,
+            # без пула — Django в начале запроса.
+            "CONN_HEALTH_CHECKS": os.getenv(
+                "POSTGRES_CONN_HEALTH_CHECKS", "true"
+            ).lower() in ("1", "true", "yes"),
+            "OPTIONS": POSTGRES_OPTIONS,
         }
     }
 elif DATABASE_CHOICE == "sqlite":
@@ -108,10 +146,79 @@ USE_I18N = True
 
 USE_TZ = True
 
-
-CELERY_BROCKER_URL = os.getenv("REDIS_URL")
-CELERY_RESULT_BACKEND = os.getenv("REDIS_URL")
-
+API_BROTLI_QUALITY = int(os.getenv("API_BROTLI_QUALITY", 4))
+
+
+# Единая конфигурация Celery для воркеров, beat и бота (bot.tasks
+# использует приложение из task_bot.celery).
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_DSN"))
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+CELERY_TIMEZONE = TIME_ZONE
+
+# Очереди: reminders — отправка напоминаний, которые нельзя задерживать,
+# housekeeping — планировщик напоминаний и прочая фоновая работа.
+# Каждую очередь обслуживает свой воркер (см. docker-compose.yaml).
+CELERY_TASK_DEFAULT_QUEUE = "housekeeping"
+CELERY_TASK_ROUTES = {
+    "bot.tasks.send_task_notification": {"queue": "reminders"},
+    "bot.tasks.send_task_reminders": {"queue": "reminders"},
+    "bot.tasks.send_reminder_digests": {"queue": "reminders"},
+    "bot.tasks.dispatch_due_reminders": {"queue": "housekeeping"},
+}
+# Задачи подтверждаются при получении: отправка напоминаний не
+# идемпотентна, и повторная доставка после падения воркера прислала бы
+# сообщение дважды. Подтверждение после выполнения включено только для
+# идемпотентных задач, см. dispatch_due_reminders. Воркер берёт по одной
+# задаче на процесс, чтобы долгая пачка не держала за собой уже
+# полученные.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(
+    os.getenv("CELERY_WORKER_PREFETCH_MULTIPLIER", 1)
+)
+CELERY_RESULT_EXPIRES = int(os.getenv("CELERY_RESULT_EXPIRES", 3600))
+# В профиле production результаты задач в Redis не сохраняются.
+CELERY_PROFILE = os.getenv("CELERY_PROFILE", "development").lower()
+CELERY_TASK_IGNORE_RESULT = CELERY_PROFILE == "production"
+
+# Напоминания о сроках задач: в REMINDER_HOUR часов по местному времени
+# в день срока. Планировщик запускается раз в REMINDER_SCHEDULER_INTERVAL
+# секунд и за один запуск ставит не больше REMINDER_MAX_BATCHES пачек.
+REMINDER_HOUR = int(os.getenv("REMINDER_HOUR", 19))
+REMINDER_SCHEDULER_INTERVAL = int(os.getenv("REMINDER_SCHEDULER_INTERVAL", 60))
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", 200))
+REMINDER_MAX_BATCHES = int(os.getenv("REMINDER_MAX_BATCHES", 50))
+REMINDER_LOOKBACK_HOURS = int(os.getenv("REMINDER_LOOKBACK_HOURS", 24))
+# В режиме дайджеста пользователь получает одно сообщение со всеми
+# задачами, срок которых наступил, и задачами со сроком в ближайшие
+# REMINDER_DIGEST_WINDOW_HOURS часов. По умолчанию выключен: каждая
+# задача напоминается отдельным сообщением.
+REMINDER_DIGEST_ENABLED = os.getenv(
+    "REMINDER_DIGEST_ENABLED", "false"
+).lower() in ("1", "true", "yes")
+REMINDER_DIGEST_WINDOW_HOURS = int(
+    os.getenv("REMINDER_DIGEST_WINDOW_HOURS", 24)
+)
+
+CELERY_BEAT_SCHEDULE = {
+    "dispatch-due-reminders": {
+        "task": "bot.tasks.dispatch_due_reminders",
+        "schedule": REMINDER_SCHEDULER_INTERVAL,
+    },
+}
+
+
+REST_FRAMEWORK = {
+    # orjson, если он установлен, иначе стандартные JSONRenderer
+    # и JSONParser, см. api.renderers.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
 
 # REST_FRAMEWORK = {
 #         'DEFAULT_AUTHENTICATION_CLASSES': [